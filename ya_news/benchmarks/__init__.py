@@ -0,0 +1,12 @@
+"""
+Нагрузочные замеры проекта YaNews.
+
+Запускаются из директории ya_news, например:
+python -m benchmarks.bad_words
+"""
+import os
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yanews.settings')
+django.setup()
@@ -0,0 +1,185 @@
+"""
+Пропускная способность главной и страницы новости под ASGI и WSGI.
+
+WSGI-приложение запускается в многопоточном сервере Django, тем же,
+что у runserver; ASGI-приложение — в uvicorn, с теми же синхронными
+представлениями (asgi) и с асинхронными представлениями главной
+и страницы новости, NEWS_ASYNC_VIEWS (asgi-async). По этим замерам
+NEWS_ASYNC_VIEWS по умолчанию выключена. Каждый сервер работает
+в отдельном процессе с общей базой в файле. Нагрузку даёт заданное
+число одновременных соединений, каждое шлёт запросы подряд.
+Выводит число ответов в секунду для анонима и вошедшего пользователя.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+
+from benchmarks.utils import test_database
+from news.models import Comment, News
+
+HOST = '127.0.0.1'
+SERVERS = ('wsgi', 'asgi', 'asgi-async')
+
+
+def serve(server, database, port):
+    """Запускает сервер в этом процессе на базе из файла database."""
+    connection.settings_dict['NAME'] = database
+    if server.startswith('asgi'):
+        import uvicorn
+
+        settings.NEWS_ASYNC_VIEWS = server == 'asgi-async'
+
+        uvicorn.run(
+            'yanews.asgi:application',
+            host=HOST,
+            port=port,
+            lifespan='off',
+            access_log=False,
+            log_level='warning',
+        )
+        return
+    from django.core.servers.basehttp import run
+
+    from yanews.wsgi import application
+
+    logging.getLogger('django.server').setLevel(logging.WARNING)
+    run(HOST, port, application, threading=True)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+def start_server(server, database):
+    port = free_port()
+    process = subprocess.Popen(
+        [
+            sys.executable, '-m', 'benchmarks.asgi_wsgi',
+            '--serve', server, '--database', database, '--port', str(port),
+        ],
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while True:
+        try:
+            socket.create_connection((HOST, port)).close()
+            return process, port
+        except OSError:
+            if time.monotonic() > deadline or process.poll() is not None:
+                process.kill()
+                raise RuntimeError(f'Сервер {server} не запустился')
+            time.sleep(0.1)
+
+
+async def fetch(port, request):
+    reader, writer = await asyncio.open_connection(HOST, port)
+    writer.write(request)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    await writer.wait_closed()
+    return response[9:12] == b'200'
+
+
+async def load(port, request, concurrency, seconds):
+    """Ответов в секунду от concurrency соединений за seconds секунд."""
+    stop = time.monotonic() + seconds
+    counts = []
+
+    async def worker():
+        count = 0
+        while time.monotonic() < stop:
+            if not await fetch(port, request):
+                raise RuntimeError('Сервер ответил не 200')
+            count += 1
+        counts.append(count)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return sum(counts) / seconds
+
+
+def make_request(url, cookie=None):
+    lines = [f'GET {url} HTTP/1.1', 'Host: localhost', 'Connection: close']
+    if cookie:
+        lines.append(f'Cookie: {cookie}')
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--concurrency', type=int, nargs='+', default=[1, 8, 32]
+    )
+    parser.add_argument('--seconds', type=float, default=3)
+    parser.add_argument('--news', type=int, default=100)
+    parser.add_argument('--comments', type=int, default=50)
+    parser.add_argument('--serve', choices=SERVERS, help=argparse.SUPPRESS)
+    parser.add_argument('--database', help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve:
+        serve(args.serve, args.database, args.port)
+        return
+
+    with tempfile.TemporaryDirectory() as directory, test_database(
+        os.path.join(directory, 'db.sqlite3')
+    ):
+        author = get_user_model().objects.create(username='Автор')
+        News.objects.bulk_create(
+            News(title=f'Новость {index}', text='Текст')
+            for index in range(args.news)
+        )
+        news = News.objects.first()
+        Comment.objects.bulk_create(
+            Comment(news=news, author=author, text=f'Комментарий {index}')
+            for index in range(args.comments)
+        )
+        client = Client()
+        client.force_login(author)
+        cookie = f'sessionid={client.cookies["sessionid"].value}'
+        database = connection.settings_dict['NAME']
+        connection.close()
+        pages = {
+            'главная': reverse('news:home'),
+            'новость': reverse('news:detail', args=(news.pk,)),
+        }
+        requests = {
+            f'{page}, {user}': make_request(url, user_cookie)
+            for page, url in pages.items()
+            for user, user_cookie in (('аноним', None), ('автор', cookie))
+        }
+        for server in SERVERS:
+            process, port = start_server(server, database)
+            try:
+                print(f'{server.upper()}:')
+                for name, request in requests.items():
+                    asyncio.run(load(port, request, 1, args.seconds / 3))
+                    results = ', '.join(
+                        f'{concurrency}: {rps:7.1f}'
+                        for concurrency in args.concurrency
+                        for rps in [asyncio.run(
+                            load(port, request, concurrency, args.seconds)
+                        )]
+                    )
+                    print(f'  {name:>17} — ответов/с по соединениям {results}')
+            finally:
+                process.terminate()
+                process.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Скорость проверки комментариев на запрещённые слова.
+
+Сравнивает прежнюю проверку (поиск каждого слова по очереди)
+с одним скомпилированным выражением на большом списке слов.
+"""
+import argparse
+import random
+import time
+
+from news.moderation import BadWordsMatcher, normalize
+
+ALPHABET = 'абвгдежзийклмнопрстуфхцчшщъыьэюя'
+
+
+def random_word(rng, min_length, max_length):
+    return ''.join(
+        rng.choice(ALPHABET)
+        for _ in range(rng.randint(min_length, max_length))
+    )
+
+
+def old_check(words, text):
+    lowered_text = text.lower()
+    for word in words:
+        if word in lowered_text:
+            return True
+    return False
+
+
+def measure(check, text, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        check(text)
+    return (time.perf_counter() - started) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--words', type=int, default=5000)
+    parser.add_argument('--size', type=int, default=100 * 1024)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    # Основы длиннее слов текста, поэтому текст их не содержит
+    # и обе проверки просматривают его целиком.
+    words = {random_word(rng, 7, 12) for _ in range(args.words)}
+    chunks = []
+    size = 0
+    while size < args.size:
+        chunk = random_word(rng, 2, 6)
+        chunks.append(chunk)
+        size += len(chunk) + 1
+    text = ' '.join(chunks)[:args.size]
+
+    started = time.perf_counter()
+    matcher = BadWordsMatcher(words)
+    compile_time = time.perf_counter() - started
+    assert not matcher.found_in(text)
+    assert not old_check([normalize(word) for word in words], text)
+
+    megabytes = len(text.encode()) / 1024 / 1024
+    print(f'Слов в списке: {len(words)}, размер комментария: {len(text)}')
+    print(f'Компиляция выражения: {compile_time * 1000:.1f} мс')
+    for name, check in (
+        ('по одному слову', lambda text: old_check(words, text)),
+        ('одно выражение', matcher.found_in),
+    ):
+        seconds = measure(check, text, args.repeat)
+        print(
+            f'{name:>16}: {seconds * 1000:8.2f} мс на комментарий, '
+            f'{megabytes / seconds:8.1f} МБ/с'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Накладные расходы диспетчеризации страницы новости.
+
+Сравнивает прежний NewsDetailView, который на каждый запрос заново
+вызывал as_view(), с текущим, где функции представлений созданы
+один раз при загрузке модуля.
+"""
+import argparse
+import timeit
+
+from django.contrib.auth import get_user_model
+from django.test import Client, override_settings
+from django.urls import path, reverse
+from django.views import generic
+
+from benchmarks.utils import requests_per_second, test_database
+from news.models import Comment, News
+from news.views import NewsComment, NewsDetail
+from yanews.urls import urlpatterns as project_urlpatterns
+
+
+class OldNewsDetailView(generic.View):
+
+    def get(self, request, *args, **kwargs):
+        view = NewsDetail.as_view()
+        return view(request, *args, **kwargs)
+
+    def post(self, request, *args, **kwargs):
+        view = NewsComment.as_view()
+        return view(request, *args, **kwargs)
+
+
+urlpatterns = [
+    path('old/<int:pk>/', OldNewsDetailView.as_view(), name='old_detail'),
+] + project_urlpatterns
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--comments', type=int, default=5)
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    number = 10000
+    seconds = timeit.timeit(
+        lambda: (NewsDetail.as_view(), NewsComment.as_view()), number=number
+    )
+    print(f'Создание функций представлений: {seconds / number * 1e6:.1f} мкс')
+
+    with test_database(), override_settings(ROOT_URLCONF=__name__):
+        author = get_user_model().objects.create(username='Автор')
+        news = News.objects.create(title='Заголовок', text='Текст')
+        Comment.objects.bulk_create(
+            Comment(news=news, author=author, text=f'Комментарий {index}')
+            for index in range(args.comments)
+        )
+        client = Client()
+        urls = {
+            'as_view() на запрос': reverse('old_detail', args=(news.pk,)),
+            'as_view() один раз': reverse('news:detail', args=(news.pk,)),
+        }
+        for url in urls.values():
+            requests_per_second(client, url, args.requests // 10)
+        best = dict.fromkeys(urls, 0)
+        # Замеры чередуются, чтобы фоновая нагрузка влияла на оба варианта.
+        for _ in range(args.rounds):
+            for name, url in urls.items():
+                rps = requests_per_second(
+                    client, url, args.requests // args.rounds
+                )
+                best[name] = max(best[name], rps)
+        for name, rps in best.items():
+            print(f'{name:>20}: {rps:8.1f} запросов/с')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""
+Одновременное чтение и запись в SQLite с разными профилями PRAGMA.
+
+Для каждого профиля создаётся новая база в файле: режим журнала
+сохраняется в самом файле. Несколько потоков добавляют комментарии,
+остальные в это же время читают новость с первой страницей
+комментариев. Выводит число операций в секунду, 99-й перцентиль
+задержки и число ошибок «database is locked».
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import OperationalError, connection
+from django.test import override_settings
+
+from benchmarks.utils import test_database
+from news.models import Comment, News
+from news.pagination import CommentPage
+
+PROFILES = {
+    'по умолчанию': {},
+    'SQLITE_PRAGMAS': settings.SQLITE_PRAGMAS,
+}
+
+
+def read(rng, news_ids, author):
+    news = News.objects.get(pk=rng.choice(news_ids))
+    list(CommentPage(news))
+
+
+def write(rng, news_ids, author):
+    Comment.objects.create(
+        news_id=rng.choice(news_ids), author=author, text='Комментарий'
+    )
+
+
+def run_workers(args, news_ids, author):
+    """Запускает читателей и писателей на args.seconds секунд."""
+    latencies = {'чтение': [], 'запись': []}
+    errors = Counter()
+    lock = threading.Lock()
+    barrier = threading.Barrier(args.readers + args.writers)
+
+    def worker(kind, operation, seed):
+        rng = random.Random(seed)
+        timings = []
+        failures = 0
+        try:
+            barrier.wait()
+            stop = time.monotonic() + args.seconds
+            while time.monotonic() < stop:
+                started = time.perf_counter()
+                try:
+                    operation(rng, news_ids, author)
+                except OperationalError:
+                    failures += 1
+                    continue
+                timings.append(time.perf_counter() - started)
+        finally:
+            connection.close()
+        with lock:
+            latencies[kind] += timings
+            errors[kind] += failures
+
+    threads = [
+        threading.Thread(target=worker, args=('чтение', read, index))
+        for index in range(args.readers)
+    ] + [
+        threading.Thread(target=worker, args=('запись', write, -index))
+        for index in range(1, args.writers + 1)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--news', type=int, default=100)
+    args = parser.parse_args()
+
+    for name, pragmas in PROFILES.items():
+        with tempfile.TemporaryDirectory() as directory, override_settings(
+            SQLITE_PRAGMAS=pragmas
+        ), test_database(os.path.join(directory, 'db.sqlite3')):
+            author = get_user_model().objects.create(username='Автор')
+            News.objects.bulk_create(
+                News(title=f'Новость {index}', text='Текст')
+                for index in range(args.news)
+            )
+            news_ids = list(News.objects.values_list('pk', flat=True))
+            connection.close()
+            latencies, errors = run_workers(args, news_ids, author)
+            print(f'{name}:')
+            for kind, timings in latencies.items():
+                p99 = (
+                    statistics.quantiles(timings, n=100)[98] * 1000
+                    if len(timings) > 1 else float('nan')
+                )
+                print(
+                    f'  {kind:>7}: {len(timings) / args.seconds:8.1f} оп/с, '
+                    f'p99 {p99:7.1f} мс, ошибок {errors[kind]}'
+                )
+
+
+if __name__ == '__main__':
+    main()
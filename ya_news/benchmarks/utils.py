@@ -0,0 +1,35 @@
+import time
+from contextlib import contextmanager
+
+from django.db import connection
+from django.test.utils import (
+    setup_test_environment, teardown_test_environment
+)
+
+
+@contextmanager
+def test_database(name=None):
+    """
+    Временная тестовая база данных с применёнными миграциями.
+
+    По умолчанию база создаётся в памяти; name задаёт путь к файлу.
+    """
+    setup_test_environment()
+    if name is not None:
+        connection.settings_dict['TEST']['NAME'] = name
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def requests_per_second(client, url, requests, method='get', **kwargs):
+    """Среднее число запросов в секунду через тестовый клиент."""
+    send = getattr(client, method)
+    started = time.perf_counter()
+    for _ in range(requests):
+        send(url, **kwargs)
+    return requests / (time.perf_counter() - started)
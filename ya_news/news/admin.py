@@ -1,6 +1,8 @@
 from django.contrib import admin
+from django.http import StreamingHttpResponse
 
-from .models import Comment, News
+from .export import CONTENT_TYPES, FORMATS, export_comments
+from .models import BadWord, Comment, News
 
 
 class CommentInline(admin.StackedInline):
@@ -10,6 +12,48 @@ class CommentInline(admin.StackedInline):
 
 @admin.register(News)
 class NewsAdmin(admin.ModelAdmin):
+    list_display = ('title', 'date', 'comment_count')
     inlines = [
         CommentInline,
     ]
+
+
+def export_action(file_format):
+    """
+    Действие, которое выгружает выбранные комментарии в файл.
+
+    Файл формируется по мере отправки, поэтому выгрузка всех
+    комментариев не загружает их в память.
+    """
+    @admin.action(
+        description=f'Выгрузить в {file_format.upper()}',
+        permissions=('view',)
+    )
+    def export(modeladmin, request, queryset):
+        response = StreamingHttpResponse(
+            export_comments(queryset, file_format),
+            content_type=CONTENT_TYPES[file_format]
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="comments.{file_format}"'
+        )
+        return response
+
+    export.__name__ = f'export_{file_format}'
+    return export
+
+
+@admin.register(Comment)
+class CommentAdmin(admin.ModelAdmin):
+    list_display = ('id', 'news', 'author', 'created')
+    list_select_related = ('news', 'author')
+    list_filter = ('created',)
+    date_hierarchy = 'created'
+    search_fields = ('text', 'author__username', 'news__title')
+    raw_id_fields = ('news', 'author')
+    actions = [export_action(file_format) for file_format in FORMATS]
+
+
+@admin.register(BadWord)
+class BadWordAdmin(admin.ModelAdmin):
+    search_fields = ('word',)
@@ -0,0 +1,59 @@
+"""
+Обращения к базе данных из асинхронных представлений.
+
+В Django 3.2 у QuerySet нет асинхронных методов, поэтому синхронный
+код выполняется в отдельном пуле из NEWS_ASYNC_DB_THREADS потоков.
+У каждого потока пула своё соединение с базой, поэтому запросы разных
+страниц идут параллельно, а не по очереди в общем потоке синхронного
+кода. При NEWS_ASYNC_DB_THREADS = 0 код выполняется в общем потоке.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+from .connections import check_connections
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.NEWS_ASYNC_DB_THREADS,
+                thread_name_prefix='news-db',
+            )
+        return _executor
+
+
+def call_in_pool(function, *args, **kwargs):
+    """
+    Вызов в потоке пула.
+
+    Потоки пула живут дольше запросов, а сигнал request_started
+    обрабатывается в другом потоке. Поэтому соединения потока пула
+    перед вызовом закрываются по CONN_MAX_AGE и после ошибок
+    и проверяются так же, как соединения потоков, обслуживающих
+    запросы. Новые соединения учитываются в db_stats сигналом
+    connection_created.
+    """
+    close_old_connections()
+    check_connections()
+    return function(*args, **kwargs)
+
+
+def run(function):
+    """Асинхронная обёртка синхронной функции, которая ходит в базу."""
+    if not settings.NEWS_ASYNC_DB_THREADS:
+        return sync_to_async(function)
+    return sync_to_async(
+        partial(call_in_pool, function),
+        thread_sensitive=False,
+        executor=get_executor(),
+    )
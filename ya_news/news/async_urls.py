@@ -0,0 +1,18 @@
+from django.urls import path
+
+from news import async_views, urls
+
+app_name = urls.app_name
+
+# Те же адреса, что в news.urls, но главную и страницу новости
+# обслуживают асинхронные представления.
+ASYNC_VIEWS = {
+    'home': async_views.news_home,
+    'detail': async_views.news_detail,
+}
+
+urlpatterns = [
+    path(str(pattern.pattern), ASYNC_VIEWS[pattern.name], name=pattern.name)
+    if pattern.name in ASYNC_VIEWS else pattern
+    for pattern in urls.urlpatterns
+]
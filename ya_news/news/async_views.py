@@ -0,0 +1,107 @@
+"""
+Асинхронные версии страниц, которые только читают: главной и новости.
+
+Под ASGI Django 3.2 выполняет все синхронные представления в одном
+общем потоке, и страницы формируются по очереди. Эти представления
+выполняют тот же код, что NewsList и NewsDetail, но в пуле потоков
+из aio, не занимая общий поток. Их подключает yanews/asgi.py, если
+включена настройка NEWS_ASYNC_VIEWS; по умолчанию она выключена:
+по замерам benchmarks/asgi_wsgi.py выигрыша у синхронных
+представлений под ASGI нет.
+"""
+from functools import partial, wraps
+
+from asgiref.sync import sync_to_async
+from django.http import Http404, HttpResponse, HttpResponseNotAllowed
+from django.template.response import TemplateResponse
+from django.views.decorators.http import condition
+
+from . import aio
+from .views import (
+    NewsDetailView, detail_context, get_news, home_etag,
+    home_last_modified, home_news, home_page, news_etag, news_last_modified
+)
+
+SAFE_METHODS = ('GET', 'HEAD')
+
+
+def async_condition(etag_func=None, last_modified_func=None):
+    """
+    Декоратор condition для асинхронных представлений.
+
+    Заголовки ETag и Last-Modified считает сам condition, а вместо
+    представления ему передаётся заглушка: если condition вернул её,
+    ответ 304 или 412 не нужен и вызывается настоящее представление.
+    """
+    def decorator(view):
+        @wraps(view)
+        async def inner(request, *args, **kwargs):
+            placeholder = HttpResponse()
+            check = condition(etag_func, last_modified_func)(
+                lambda *args, **kwargs: placeholder
+            )
+            response = await aio.run(check)(request, *args, **kwargs)
+            if response is not placeholder:
+                return response
+            response = await view(request, *args, **kwargs)
+            for header in ('ETag', 'Last-Modified'):
+                if header in placeholder and not response.has_header(header):
+                    response[header] = placeholder[header]
+            return response
+        return inner
+    return decorator
+
+
+def render(request, template_name, context):
+    return TemplateResponse(request, template_name, context).render()
+
+
+def render_home(request):
+    object_list = list(home_news())
+    return render(
+        request,
+        'news/home.html',
+        {'object_list': object_list, 'news_list': object_list},
+    )
+
+
+@async_condition(etag_func=home_etag, last_modified_func=home_last_modified)
+async def news_home(request):
+    """Главная страница, то же, что NewsList."""
+    return await aio.run(home_page)(request, partial(render_home, request))
+
+
+news_home.replica_reads = True
+
+
+def render_detail(request, pk):
+    news = get_news(request, pk)
+    if news is None:
+        raise Http404('Новость не найдена.')
+    context = {'object': news, 'news': news}
+    context.update(detail_context(request, news))
+    return render(request, 'news/detail.html', context)
+
+
+@async_condition(etag_func=news_etag, last_modified_func=news_last_modified)
+async def news_detail_page(request, pk):
+    return await aio.run(render_detail)(request, pk)
+
+
+async def news_detail(request, pk):
+    """
+    Страница новости, то же, что NewsDetailView.
+
+    Добавление комментария пишет в базу, поэтому POST обрабатывает
+    синхронный NewsComment.
+    """
+    if request.method in SAFE_METHODS:
+        return await news_detail_page(request, pk)
+    if request.method == 'POST':
+        return await sync_to_async(NewsDetailView.comment_view)(
+            request, pk=pk
+        )
+    return HttpResponseNotAllowed(('GET', 'HEAD', 'POST'))
+
+
+news_detail.replica_reads = True
@@ -0,0 +1,104 @@
+import time
+
+from django.core.cache import cache
+from django.db.models import F
+from django.http import HttpResponse
+from django.utils import timezone
+
+from .models import HomeVersion
+
+HOME_VERSION_PK = 1
+PAGE_STATS_KEY = 'news:page_cache:{page}:{result}'
+PAGE_CACHE_RESULTS = ('hit', 'stale', 'miss')
+CACHED_PAGES = ('home',)
+
+
+def bump_home_version():
+    """
+    Отмечает изменение главной страницы.
+
+    Счётчик увеличивается одним UPDATE на стороне базы данных в текущей
+    транзакции, поэтому одновременные изменения не теряются, а новая
+    версия видна вместе с изменёнными новостями.
+    """
+    now = timezone.now()
+    updated = HomeVersion.objects.filter(pk=HOME_VERSION_PK).update(
+        version=F('version') + 1, modified=now
+    )
+    if not updated:
+        HomeVersion.objects.get_or_create(
+            pk=HOME_VERSION_PK, defaults={'version': 1, 'modified': now}
+        )
+
+
+def get_home_version():
+    """Версия главной страницы и время её последнего изменения."""
+    return HomeVersion.objects.filter(
+        pk=HOME_VERSION_PK
+    ).values_list('version', 'modified').first() or (0, None)
+
+
+def count_page_cache_result(page, result):
+    key = PAGE_STATS_KEY.format(page=page, result=result)
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Ключ вытеснен из кеша между add и incr.
+        cache.add(key, 1, None)
+
+
+def get_page_cache_stats():
+    """Счётчики попаданий и промахов кеша для всех страниц."""
+    keys = {
+        PAGE_STATS_KEY.format(page=page, result=result): (page, result)
+        for page in CACHED_PAGES
+        for result in PAGE_CACHE_RESULTS
+    }
+    values = cache.get_many(keys)
+    return {
+        keys[key]: values.get(key, 0) for key in keys
+    }
+
+
+def cached_page(page, version, render, timeout, lock_timeout):
+    """
+    Отдаёт страницу из кеша или формирует её заново.
+
+    Запись считается свежей, пока совпадает версия и не истёк timeout.
+    Устаревшую запись обновляет только тот запрос, который первым
+    захватил блокировку; остальные в это время получают устаревшую
+    копию, поэтому сброс кеша не вызывает лавины одинаковых запросов.
+    """
+    key = f'news:page_cache:{page}'
+    lock_key = f'{key}:lock'
+    entry = cache.get(key)
+    if entry is not None:
+        if entry['version'] == version and entry['expires'] > time.time():
+            return _cached_response(page, entry, 'hit')
+        if not cache.add(lock_key, True, lock_timeout):
+            return _cached_response(page, entry, 'stale')
+    try:
+        response = render()
+        if response.status_code == 200:
+            cache.set(key, {
+                'version': version,
+                'expires': time.time() + timeout,
+                'content': response.content,
+                'content_type': response['Content-Type'],
+            }, None)
+    finally:
+        if entry is not None:
+            cache.delete(lock_key)
+    count_page_cache_result(page, 'miss')
+    response['X-Cache'] = 'MISS'
+    return response
+
+
+def _cached_response(page, entry, result):
+    count_page_cache_result(page, result)
+    response = HttpResponse(
+        entry['content'], content_type=entry['content_type']
+    )
+    response['X-Cache'] = result.upper()
+    return response
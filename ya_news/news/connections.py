@@ -0,0 +1,41 @@
+import threading
+
+from django.db import connections
+
+STATS = ('requests', 'connections_opened', 'health_check_failures')
+
+_stats = dict.fromkeys(STATS, 0)
+_lock = threading.Lock()
+
+
+def count(name):
+    with _lock:
+        _stats[name] += 1
+
+
+def connection_stats():
+    """Счётчики запросов и открытых соединений с базой в этом процессе."""
+    with _lock:
+        return dict(_stats)
+
+
+def check_connections():
+    """
+    Проверяет соединения, оставшиеся открытыми с прошлого запроса.
+
+    Django 3.2 переиспользует соединение CONN_MAX_AGE секунд, но
+    не проверяет, живо ли оно: при разрыве запрос получил бы ошибку.
+    Для баз с CONN_HEALTH_CHECKS соединение перед запросом проверяется
+    и при необходимости закрывается, а новое откроется при первом
+    обращении. Настройка названа так же, как в Django 4.1, где эта
+    проверка встроена.
+    """
+    for connection in connections.all():
+        if (
+            connection.connection is None
+            or not connection.settings_dict.get('CONN_HEALTH_CHECKS')
+        ):
+            continue
+        if not connection.is_usable():
+            count('health_check_failures')
+            connection.close()
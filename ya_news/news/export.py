@@ -0,0 +1,82 @@
+import csv
+import json
+
+from .models import Comment
+
+FORMATS = ('csv', 'jsonl')
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+}
+FIELDS = ('id', 'news_id', 'author', 'created', 'text')
+EXPORT_CHUNK_SIZE = 2000
+
+
+def filter_comments(
+    comments=None, news=None, author=None, since=None, until=None,
+    after=None
+):
+    """
+    Комментарии для выгрузки.
+
+    since и until — границы времени создания, until не включается.
+    after — курсор продолжения: id последнего выгруженного комментария.
+    """
+    if comments is None:
+        comments = Comment.objects.all()
+    if news is not None:
+        comments = comments.filter(news=news)
+    if author is not None:
+        comments = comments.filter(author=author)
+    if since is not None:
+        comments = comments.filter(created__gte=since)
+    if until is not None:
+        comments = comments.filter(created__lt=until)
+    if after is not None:
+        comments = comments.filter(pk__gt=after)
+    return comments
+
+
+def comment_rows(comments, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Строки выгрузки в порядке id вместе с именем автора.
+
+    Автор присоединяется в том же запросе, а строки читаются из курсора
+    базы порциями по chunk_size, поэтому память не зависит от размера
+    выгрузки. Порядок по id позволяет продолжить прерванную выгрузку
+    с курсором after.
+    """
+    return comments.order_by('pk').values_list(
+        'pk', 'news_id', 'author__username', 'created', 'text'
+    ).iterator(chunk_size=chunk_size)
+
+
+class EchoBuffer:
+    """Файл для csv.writer, который возвращает строку вместо записи."""
+
+    def write(self, value):
+        return value
+
+
+def format_rows(rows, file_format, header=True):
+    """Строки файла CSV или JSONL для строк выгрузки."""
+    if file_format == 'csv':
+        writer = csv.writer(EchoBuffer())
+        if header:
+            yield writer.writerow(FIELDS)
+        for pk, news_id, author, created, text in rows:
+            yield writer.writerow(
+                (pk, news_id, author, created.isoformat(), text)
+            )
+        return
+    for pk, news_id, author, created, text in rows:
+        yield json.dumps(
+            dict(zip(
+                FIELDS, (pk, news_id, author, created.isoformat(), text)
+            )),
+            ensure_ascii=False
+        ) + '\n'
+
+
+def export_comments(comments, file_format, chunk_size=EXPORT_CHUNK_SIZE):
+    return format_rows(comment_rows(comments, chunk_size), file_format)
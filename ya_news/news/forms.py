@@ -2,14 +2,18 @@ from django.forms import ModelForm
 from django.core.exceptions import ValidationError
 
 from .models import Comment
+from .moderation import ReloadingBadWordsMatcher
 
+# Список используется, пока из базы данных не загружены слова,
+# которые редактируются в админке.
 BAD_WORDS = (
     'редиска',
     'негодяй',
-    # Дополните список на своё усмотрение.
 )
 WARNING = 'Не ругайтесь!'
 
+bad_words_matcher = ReloadingBadWordsMatcher(BAD_WORDS)
+
 
 class CommentForm(ModelForm):
 
@@ -20,8 +24,6 @@ class CommentForm(ModelForm):
     def clean_text(self):
         """Не позволяем ругаться в комментариях."""
         text = self.cleaned_data['text']
-        lowered_text = text.lower()
-        for word in BAD_WORDS:
-            if word in lowered_text:
-                raise ValidationError(WARNING)
+        if bad_words_matcher.found_in(text):
+            raise ValidationError(WARNING)
         return text
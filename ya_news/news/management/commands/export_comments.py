@@ -0,0 +1,107 @@
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from news.export import (
+    EXPORT_CHUNK_SIZE, FORMATS, comment_rows, filter_comments, format_rows
+)
+
+
+def date_argument(value):
+    try:
+        date = parse_date(value)
+    except ValueError:
+        date = None
+    if date is None:
+        raise ValueError(value)
+    return date
+
+
+def start_of_day(date):
+    return timezone.make_aware(datetime.combine(date, time.min))
+
+
+class Command(BaseCommand):
+    help = 'Выгружает комментарии с именами авторов в CSV или JSONL.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--news', type=int, help='id новости.')
+        parser.add_argument('--author', help='Имя автора.')
+        parser.add_argument(
+            '--since', type=date_argument,
+            help='Первый день выгрузки, ГГГГ-ММ-ДД.'
+        )
+        parser.add_argument(
+            '--until', type=date_argument,
+            help='Последний день выгрузки включительно, ГГГГ-ММ-ДД.'
+        )
+        parser.add_argument(
+            '--after', type=int,
+            help='Курсор продолжения: id последнего выгруженного '
+                 'комментария. Файл из --output тогда дописывается.'
+        )
+        parser.add_argument('--format', choices=FORMATS, default='csv')
+        parser.add_argument(
+            '--output',
+            help='Путь к файлу; по умолчанию комментарии выводятся на экран.'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=EXPORT_CHUNK_SIZE,
+            help='Сколько комментариев читать из базы за раз.'
+        )
+
+    def handle(self, *args, **options):
+        author = None
+        if options['author']:
+            try:
+                author = get_user_model().objects.get(
+                    username=options['author']
+                )
+            except get_user_model().DoesNotExist:
+                raise CommandError(
+                    f'Пользователь {options["author"]} не найден.'
+                )
+        comments = filter_comments(
+            news=options['news'],
+            author=author,
+            since=options['since'] and start_of_day(options['since']),
+            until=options['until'] and start_of_day(
+                options['until'] + timedelta(days=1)
+            ),
+            after=options['after'],
+        )
+        self.last_pk = options['after']
+        lines = format_rows(
+            self.track(comment_rows(comments, options['chunk_size'])),
+            options['format'],
+            header=options['after'] is None
+        )
+        try:
+            if options['output']:
+                mode = 'w' if options['after'] is None else 'a'
+                with open(
+                    options['output'], mode, encoding='utf-8', newline=''
+                ) as file:
+                    for line in lines:
+                        file.write(line)
+            else:
+                for line in lines:
+                    self.stdout.write(line, ending='')
+        except (OSError, KeyboardInterrupt) as error:
+            raise CommandError(
+                f'Выгрузка прервана: {error!r}. '
+                f'Продолжить можно с --after {self.last_pk or 0}'
+            )
+        self.stderr.write(
+            f'Выгрузка завершена, курсор продолжения: --after '
+            f'{self.last_pk or 0}'
+        )
+
+    def track(self, rows):
+        """Запоминает id последнего выгруженного комментария."""
+        for row in rows:
+            yield row
+            self.last_pk = row[0]
@@ -0,0 +1,184 @@
+import csv
+import io
+import json
+import os
+import sys
+import time
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils.dateparse import parse_date
+
+from news.cache import bump_home_version
+from news.models import News
+from news.search import index_many_news
+
+TITLE_MAX_LENGTH = News._meta.get_field('title').max_length
+FIELDS = ('title', 'text', 'date')
+
+
+def read_jsonl(file):
+    for line in file:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as error:
+            raise ValueError(f'некорректный JSON: {error}')
+
+
+def read_csv(file):
+    return csv.DictReader(file)
+
+
+READERS = {
+    'jsonl': read_jsonl,
+    'csv': read_csv,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает новости из файла JSONL или CSV с полями '
+        'title, text и необязательным date (ГГГГ-ММ-ДД).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path', help='Путь к файлу или «-» для стандартного ввода.'
+        )
+        parser.add_argument(
+            '--format', choices=tuple(READERS),
+            help='Формат файла; по умолчанию определяется по расширению.'
+        )
+        parser.add_argument(
+            '--offset', type=int, default=0,
+            help='Сколько записей с начала файла пропустить, '
+                 'например загруженных при прерванном запуске.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Сколько новостей вставлять одним запросом.'
+        )
+        parser.add_argument(
+            '--transaction-size', type=int, default=20000,
+            help='Сколько новостей сохранять в одной транзакции.'
+        )
+        parser.add_argument(
+            '--skip-search-index', action='store_true',
+            help='Не добавлять новости в поисковый индекс; '
+                 'его можно построить позже командой rebuild_search_index.'
+        )
+
+    def handle(self, *args, **options):
+        """
+        Новости читаются из файла потоком и сохраняются порциями.
+
+        Каждая порция сохраняется в своей транзакции, поэтому после сбоя
+        загрузку можно продолжить с --offset, который выводится в отчёте.
+        """
+        path = options['path']
+        file_format = options['format'] or self.guess_format(path)
+        if path == '-':
+            file = io.TextIOWrapper(
+                sys.stdin.buffer, encoding='utf-8', newline=''
+            )
+        else:
+            try:
+                file = open(path, encoding='utf-8', newline='')
+            except OSError as error:
+                raise CommandError(error)
+        committed = options['offset']
+        started = time.perf_counter()
+        with file:
+            records = islice(
+                enumerate(READERS[file_format](file), start=1),
+                committed, None
+            )
+            while True:
+                try:
+                    chunk = [
+                        self.make_news(number, record)
+                        for number, record in islice(
+                            records, options['transaction_size']
+                        )
+                    ]
+                except (ValueError, csv.Error, UnicodeDecodeError) as error:
+                    raise CommandError(
+                        f'{error}. Загрузку можно продолжить '
+                        f'с --offset {committed}'
+                    )
+                if not chunk:
+                    break
+                with transaction.atomic():
+                    self.save(
+                        chunk,
+                        options['batch_size'],
+                        not options['skip_search_index']
+                    )
+                committed += len(chunk)
+                self.report(committed, committed - options['offset'], started)
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено новостей: {committed - options["offset"]}'
+        ))
+
+    def guess_format(self, path):
+        extension = os.path.splitext(path)[1].lstrip('.').lower()
+        if extension not in READERS:
+            raise CommandError(
+                'Не удалось определить формат файла, укажите --format.'
+            )
+        return extension
+
+    def make_news(self, number, record):
+        if not isinstance(record, dict):
+            raise ValueError(f'Запись {number}: ожидался объект JSON')
+        for field in FIELDS:
+            if not isinstance(record.get(field) or '', str):
+                raise ValueError(
+                    f'Запись {number}: поле {field} должно быть строкой'
+                )
+        title = record.get('title') or ''
+        text = record.get('text') or ''
+        if not title or not text:
+            raise ValueError(f'Запись {number}: нет заголовка или текста')
+        if len(title) > TITLE_MAX_LENGTH:
+            raise ValueError(
+                f'Запись {number}: заголовок длиннее '
+                f'{TITLE_MAX_LENGTH} символов'
+            )
+        news = News(title=title, text=text)
+        if record.get('date'):
+            try:
+                news.date = parse_date(record['date'])
+            except ValueError:
+                news.date = None
+            if news.date is None:
+                raise ValueError(
+                    f'Запись {number}: некорректная дата {record["date"]!r}'
+                )
+        return news
+
+    def save(self, chunk, batch_size, index):
+        # bulk_create не вызывает сигналов, поэтому версия главной
+        # страницы меняется здесь, в транзакции порции.
+        News.objects.bulk_create(chunk, batch_size=batch_size)
+        bump_home_version()
+        if not index:
+            return
+        # bulk_create на SQLite не возвращает id. Пока транзакция держит
+        # блокировку записи, последние id в таблице — только что
+        # вставленные, по возрастанию в порядке вставки.
+        pks = News.objects.order_by('-pk').values_list(
+            'pk', flat=True
+        )[:len(chunk)]
+        for news, pk in zip(chunk, reversed(pks)):
+            news.pk = pk
+        index_many_news(chunk)
+
+    def report(self, position, imported, started):
+        rate = imported / (time.perf_counter() - started)
+        self.stdout.write(
+            f'Обработано записей: {position}, {rate:.0f} строк/с'
+        )
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.template import TemplateSyntaxError
+
+from news.template_warmup import precompile_templates
+
+
+class Command(BaseCommand):
+    help = (
+        'Разбирает все шаблоны проекта; '
+        'при синтаксической ошибке завершается с ошибкой.'
+    )
+
+    def handle(self, *args, **options):
+        try:
+            count = precompile_templates()
+        except TemplateSyntaxError as error:
+            raise CommandError(f'Ошибка в шаблоне {error}')
+        self.stdout.write(self.style.SUCCESS(f'Разобрано шаблонов: {count}'))
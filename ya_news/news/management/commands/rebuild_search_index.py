@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from news.search import REBUILD_BATCH_SIZE, rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Заново строит поисковый индекс новостей и комментариев.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=REBUILD_BATCH_SIZE,
+            help='Сколько записей читать и вставлять за раз.'
+        )
+
+    def handle(self, *args, **options):
+        news_count, comment_count = rebuild_index(
+            batch_size=options['batch_size']
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Проиндексировано новостей: {news_count}, '
+            f'комментариев: {comment_count}'
+        ))
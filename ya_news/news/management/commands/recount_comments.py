@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from news.cache import bump_home_version
+from news.models import Comment, News
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает счётчики комментариев всех новостей.'
+
+    def handle(self, *args, **options):
+        comment_count = Comment.objects.filter(
+            news=OuterRef('pk')
+        ).order_by().values('news').annotate(
+            count=Count('pk')
+        ).values('count')
+        actual_count = Coalesce(Subquery(comment_count), 0)
+        # Время изменения меняется только у исправленных новостей:
+        # по нему строятся версии страниц в кеше.
+        with transaction.atomic():
+            updated = News.objects.exclude(
+                comment_count=actual_count
+            ).update(comment_count=actual_count, modified=timezone.now())
+            if updated:
+                bump_home_version()
+        self.stdout.write(
+            self.style.SUCCESS(f'Исправлено счётчиков: {updated}')
+        )
@@ -0,0 +1,77 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+
+from .routers import (
+    RoutingState, is_pinned_to_primary, pin_to_primary, routing_state,
+    use_replica
+)
+
+SAFE_METHODS = ('GET', 'HEAD')
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Отправляет чтения представлений с replica_reads = True на реплику.
+
+    Реплика используется только для GET и HEAD и только если
+    пользователь недавно ничего не записывал: иначе реплика могла ещё
+    не получить его комментарий. Если в запросе была запись,
+    пользователь читает с основной базы ещё NEWS_REPLICA_PIN_SECONDS
+    секунд. Middleware должен стоять после AuthenticationMiddleware.
+
+    Версии страниц в кеше читаются из той же базы, что и их содержимое,
+    поэтому страница, сформированная по отстающей реплике, кешируется
+    под версией реплики и не выдаётся за более свежую.
+
+    Под ASGI работает асинхронно, как MiddlewareMixin: синхронный
+    middleware в цепочке заставил бы асинхронные представления
+    (NEWS_ASYNC_VIEWS) выполняться в общем потоке синхронного кода.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        state = RoutingState()
+        token = routing_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            routing_state.reset(token)
+        if state.wrote:
+            self.remember_write(request, response)
+        return response
+
+    async def __acall__(self, request):
+        state = RoutingState()
+        token = routing_state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            routing_state.reset(token)
+        if state.wrote:
+            await sync_to_async(self.remember_write)(request, response)
+        return response
+
+    def remember_write(self, request, response):
+        if request.user.is_authenticated:
+            pin_to_primary(response, request.user.pk)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view = getattr(view_func, 'view_class', view_func)
+        if (
+            getattr(view, 'replica_reads', False)
+            and request.method in SAFE_METHODS
+            and not (
+                request.user.is_authenticated
+                and is_pinned_to_primary(request)
+            )
+        ):
+            use_replica(routing_state.get())
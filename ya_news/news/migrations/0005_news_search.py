@@ -0,0 +1,78 @@
+# Generated by Django 3.2.15 on 2026-10-17 09:12
+
+import re
+from itertools import chain, islice
+
+import snowballstemmer
+from django.db import migrations
+
+# Поисковый индекс хранит основы слов, а не исходные тексты: русскую
+# морфологию FTS5 не знает, поэтому слова приводятся к основам в Python
+# (news.search), и индекс обновляется из сигналов, а не триггерами.
+CREATE_SEARCH = """
+    CREATE VIRTUAL TABLE news_search USING fts5(
+        title, text, news_id UNINDEXED,
+        tokenize='unicode61 remove_diacritics 2'
+    )
+"""
+DROP_SEARCH = 'DROP TABLE news_search'
+INSERT_SEARCH = (
+    'INSERT INTO news_search(rowid, title, text, news_id) '
+    'VALUES (%s, %s, %s, %s)'
+)
+OPTIMIZE_SEARCH = "INSERT INTO news_search(news_search) VALUES ('optimize')"
+TERM = re.compile(r'\w+')
+BATCH_SIZE = 1000
+
+
+def build_index(apps, schema_editor):
+    """
+    Индексирует новости и комментарии, которые уже есть в базе.
+
+    Приведение к основам и rowid повторяют news.search на момент этой
+    миграции, а не импортируются оттуда, чтобы миграция давала тот же
+    результат и после изменений модуля. Чётный rowid — новость,
+    нечётный — комментарий.
+    """
+    stemmer = snowballstemmer.stemmer('russian')
+
+    def stem_text(text):
+        words = TERM.findall(text.lower().replace('ё', 'е'))
+        return ' '.join(stemmer.stemWords(words))
+
+    alias = schema_editor.connection.alias
+    news = apps.get_model('news', 'News').objects.using(alias)
+    comments = apps.get_model('news', 'Comment').objects.using(alias)
+    rows = chain(
+        (
+            (obj.pk * 2, stem_text(obj.title), stem_text(obj.text), obj.pk)
+            for obj in news.only('id', 'title', 'text').order_by(
+                'pk'
+            ).iterator(chunk_size=BATCH_SIZE)
+        ),
+        (
+            (obj.pk * 2 + 1, '', stem_text(obj.text), obj.news_id)
+            for obj in comments.only('id', 'news_id', 'text').order_by(
+                'pk'
+            ).iterator(chunk_size=BATCH_SIZE)
+        ),
+    )
+    with schema_editor.connection.cursor() as cursor:
+        while True:
+            batch = list(islice(rows, BATCH_SIZE))
+            if not batch:
+                break
+            cursor.executemany(INSERT_SEARCH, batch)
+        cursor.execute(OPTIMIZE_SEARCH)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0004_badword'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_SEARCH, DROP_SEARCH),
+        migrations.RunPython(build_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 3.2.15 on 2026-10-17 12:10
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def create_home_version(apps, schema_editor):
+    HomeVersion = apps.get_model('news', 'HomeVersion')
+    HomeVersion.objects.get_or_create(
+        pk=1, defaults={'version': 1, 'modified': timezone.now()}
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0007_news_modified'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HomeVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveBigIntegerField(default=0)),
+                ('modified', models.DateTimeField(null=True)),
+            ],
+        ),
+        migrations.RunPython(create_home_version, migrations.RunPython.noop),
+    ]
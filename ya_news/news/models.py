@@ -8,9 +8,19 @@ class News(models.Model):
     title = models.CharField(max_length=50)
     text = models.TextField()
     date = models.DateField(default=datetime.today)
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        db_index=True,
+        editable=False,
+    )
+    # Меняется и при изменении комментариев новости (см. signals.py).
+    modified = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         ordering = ('-date',)
+        indexes = (
+            models.Index(fields=('date',), name='news_date_idx'),
+        )
         verbose_name_plural = 'Новости'
         verbose_name = 'Новость'
 
@@ -32,6 +42,50 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ('created',)
+        indexes = (
+            models.Index(
+                fields=('news', 'created'), name='comment_news_created_idx'
+            ),
+            models.Index(
+                fields=('author', 'created'),
+                name='comment_author_created_idx'
+            ),
+        )
 
     def __str__(self):
         return self.text[:50]
+
+
+class BadWord(models.Model):
+    word = models.CharField('Основа слова', max_length=50, unique=True)
+
+    class Meta:
+        ordering = ('word',)
+        verbose_name_plural = 'Запрещённые слова'
+        verbose_name = 'Запрещённое слово'
+
+    def __str__(self):
+        return self.word
+
+
+class BadWordsVersion(models.Model):
+    """
+    Версия списка запрещённых слов.
+
+    Одна строка, счётчик которой растёт при каждом изменении списка.
+    Хранится в базе, поэтому изменение видят все процессы.
+    """
+    version = models.PositiveBigIntegerField(default=0)
+
+
+class HomeVersion(models.Model):
+    """
+    Версия главной страницы.
+
+    Одна строка, счётчик которой растёт при добавлении, изменении
+    и удалении новостей и при изменении числа комментариев.
+    По ней строятся ETag и версия кеша главной страницы: чтение строки
+    по первичному ключу не зависит от числа новостей.
+    """
+    version = models.PositiveBigIntegerField(default=0)
+    modified = models.DateTimeField(null=True)
@@ -0,0 +1,180 @@
+import re
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+
+from .models import BadWord, BadWordsVersion
+
+# Латинские буквы и цифры, которыми подменяют похожие кириллические.
+HOMOGLYPHS = str.maketrans({
+    'a': 'а',
+    'b': 'в',
+    'c': 'с',
+    'e': 'е',
+    'h': 'н',
+    'k': 'к',
+    'm': 'м',
+    'o': 'о',
+    'p': 'р',
+    't': 'т',
+    'x': 'х',
+    'y': 'у',
+    'ё': 'е',
+    '0': 'о',
+    '3': 'з',
+})
+NEVER_MATCHES = re.compile(r'(?!)')
+BAD_WORDS_VERSION_PK = 1
+
+
+def normalize(text):
+    """Приводит текст к нижнему регистру и заменяет гомоглифы."""
+    return text.casefold().translate(HOMOGLYPHS)
+
+
+def _trie_to_regex(node):
+    """
+    Собирает регулярное выражение из префиксного дерева.
+
+    Общие начала слов попадают в выражение один раз, поэтому при поиске
+    каждая позиция текста отсекается по первому несовпавшему символу.
+    """
+    if '' in node:
+        # Основа слова найдена, продолжение уже не важно.
+        return ''
+    leaves = []
+    branches = []
+    for char, child in sorted(node.items()):
+        tail = _trie_to_regex(child)
+        if tail:
+            branches.append(re.escape(char) + tail)
+        else:
+            leaves.append(re.escape(char))
+    if leaves:
+        branches.append(
+            leaves[0] if len(leaves) == 1 else f'[{"".join(leaves)}]'
+        )
+    if len(branches) == 1:
+        return branches[0]
+    return f'(?:{"|".join(branches)})'
+
+
+def compile_bad_words(words):
+    """
+    Компилирует список основ запрещённых слов в одно выражение.
+
+    Основа ищется в начале слова: «редиска» найдётся в «редиски»,
+    но не в «нередиска».
+    """
+    trie = {}
+    for word in words:
+        word = normalize(word.strip())
+        if not word:
+            continue
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    if not trie:
+        return NEVER_MATCHES
+    return re.compile(r'\b' + _trie_to_regex(trie))
+
+
+class BadWordsMatcher:
+    """Проверяет текст на запрещённые слова за один проход."""
+
+    def __init__(self, words):
+        self.pattern = compile_bad_words(words)
+
+    def found_in(self, text):
+        return self.pattern.search(normalize(text)) is not None
+
+
+def bump_bad_words_version():
+    """
+    Сообщает всем процессам, что список запрещённых слов изменился.
+
+    Версия меняется после фиксации транзакции: иначе процесс мог бы
+    прочитать новую версию вместе со старым списком и не перечитывать
+    его до следующего изменения.
+    """
+    transaction.on_commit(_increment_bad_words_version)
+
+
+def _increment_bad_words_version():
+    updated = BadWordsVersion.objects.filter(
+        pk=BAD_WORDS_VERSION_PK
+    ).update(version=F('version') + 1)
+    if not updated:
+        BadWordsVersion.objects.get_or_create(
+            pk=BAD_WORDS_VERSION_PK, defaults={'version': 1}
+        )
+
+
+def get_bad_words_version():
+    return BadWordsVersion.objects.filter(
+        pk=BAD_WORDS_VERSION_PK
+    ).values_list('version', flat=True).first() or 0
+
+
+def load_bad_words():
+    return list(BadWord.objects.values_list('word', flat=True))
+
+
+class ReloadingBadWordsMatcher(BadWordsMatcher):
+    """
+    Проверка на запрещённые слова из базы данных.
+
+    Скомпилированное выражение хранится в процессе. Не чаще раза
+    в BAD_WORDS_CHECK_INTERVAL секунд версия списка сверяется с базой;
+    если она изменилась, выражение пересобирается в отдельном потоке,
+    а до тех пор проверка идёт по прежнему выражению.
+    """
+
+    def __init__(self, words, loader=load_bad_words):
+        super().__init__(words)
+        self.loader = loader
+        self.version = None
+        self.checked_at = None
+        self._lock = threading.Lock()
+        self._reloading = False
+
+    def found_in(self, text):
+        self.check_version()
+        return super().found_in(text)
+
+    def check_version(self):
+        now = time.monotonic()
+        if (
+            self.checked_at is not None
+            and now - self.checked_at < settings.BAD_WORDS_CHECK_INTERVAL
+        ):
+            return
+        self.checked_at = now
+        version = get_bad_words_version()
+        if version != self.version:
+            self.reload(version)
+
+    def reload(self, version):
+        with self._lock:
+            if self._reloading:
+                return
+            self._reloading = True
+        if settings.BAD_WORDS_RELOAD_IN_BACKGROUND:
+            threading.Thread(
+                target=self._reload, args=(version, True), daemon=True
+            ).start()
+        else:
+            self._reload(version)
+
+    def _reload(self, version, in_background=False):
+        try:
+            self.pattern = compile_bad_words(self.loader())
+            self.version = version
+        finally:
+            self._reloading = False
+            if in_background:
+                connection.close()
@@ -0,0 +1,143 @@
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+from .models import Comment
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+# Границы частей курсора: время не позже datetime.max, id не больше
+# наибольшего целого, которое SQLite хранит в INTEGER.
+MAX_CURSOR_MICROS = (
+    datetime.max.replace(tzinfo=timezone.utc) - EPOCH
+) // MICROSECOND
+MAX_CURSOR_PK = 2 ** 63 - 1
+
+
+def encode_cursor(created, pk):
+    """Курсор комментария: время создания в микросекундах и id."""
+    return f'{(created - EPOCH) // MICROSECOND}-{pk}'
+
+
+def decode_cursor(cursor):
+    """
+    Разбирает курсор комментария.
+
+    Для некорректного курсора и курсора вне допустимых границ
+    возвращает None.
+    """
+    try:
+        micros, pk = (int(part) for part in cursor.split('-'))
+    except (AttributeError, ValueError):
+        return None
+    if not (0 <= micros <= MAX_CURSOR_MICROS and 0 < pk <= MAX_CURSOR_PK):
+        return None
+    try:
+        return EPOCH + micros * MICROSECOND, pk
+    except OverflowError:
+        return None
+
+
+def comments_after(comments, cursor):
+    created, pk = cursor
+    return comments.filter(
+        Q(created__gt=created) | Q(created=created, pk__gt=pk)
+    ).order_by('created', 'pk')
+
+
+def comments_before(comments, cursor):
+    created, pk = cursor
+    return comments.filter(
+        Q(created__lt=created) | Q(created=created, pk__lt=pk)
+    ).order_by('-created', '-pk')
+
+
+class CommentPage:
+    """
+    Страница комментариев к новости.
+
+    Страницы выбираются по курсору (created, id), а не через OFFSET,
+    поэтому любая страница стоит столько же, сколько первая.
+    Запрос к базе данных выполняется при первом обращении к странице.
+    """
+
+    def __init__(self, news, after=None, before=None, per_page=None):
+        self.news = news
+        self.after = decode_cursor(after) if after else None
+        self.before = decode_cursor(before) if before else None
+        self.per_page = per_page or settings.COMMENTS_COUNT_ON_NEWS_PAGE
+        self._has_next = False
+        self._has_previous = False
+
+    def get_queryset(self):
+        """
+        Запрос комментариев страницы.
+
+        Выбирается на один комментарий больше размера страницы, чтобы
+        узнать, есть ли следующая (или, для before, предыдущая).
+        """
+        comments = self.news.comment_set.select_related('author')
+        if self.before and not self.after:
+            return comments_before(comments, self.before)[:self.per_page + 1]
+        if self.after:
+            comments = comments_after(comments, self.after)
+        else:
+            comments = comments.order_by('created', 'pk')
+        return comments[:self.per_page + 1]
+
+    @cached_property
+    def object_list(self):
+        rows = list(self.get_queryset())
+        if self.before and not self.after:
+            self._has_next = True
+            self._has_previous = len(rows) > self.per_page
+            return rows[:self.per_page][::-1]
+        self._has_previous = bool(self.after)
+        self._has_next = len(rows) > self.per_page
+        return rows[:self.per_page]
+
+    @property
+    def has_next(self):
+        return bool(self.object_list) and self._has_next
+
+    @property
+    def has_previous(self):
+        return bool(self.object_list) and self._has_previous
+
+    @property
+    def next_cursor(self):
+        if not self.object_list:
+            return None
+        last = self.object_list[-1]
+        return encode_cursor(last.created, last.pk)
+
+    @property
+    def previous_cursor(self):
+        if not self.object_list:
+            return None
+        first = self.object_list[0]
+        return encode_cursor(first.created, first.pk)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def page_cursor_for(comment, per_page=None):
+    """
+    Курсор страницы, которая заканчивается комментарием comment.
+
+    Для комментариев с первой страницы возвращает None.
+    """
+    per_page = per_page or settings.COMMENTS_COUNT_ON_NEWS_PAGE
+    previous = comments_before(
+        Comment.objects.filter(news_id=comment.news_id),
+        (comment.created, comment.pk)
+    ).values_list('created', 'pk')[per_page - 1:per_page]
+    for created, pk in previous:
+        return encode_cursor(created, pk)
+    return None
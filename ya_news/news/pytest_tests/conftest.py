@@ -2,17 +2,36 @@ from datetime import datetime, timedelta
 
 import pytest
 from django.conf import settings
+from django.core.cache import cache
 from django.test.client import Client
 from django.urls import reverse
 from django.utils import timezone
 
-from news.models import Comment, News
+from news.models import BadWord, Comment, News
 
 
 NEWS_COUNT = settings.NEWS_COUNT_ON_HOME_PAGE + 1
 COMMENTS_COUNT = 10
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """
+    Кеш очищается перед каждым тестом.
+
+    После отката транзакции id объектов могут повториться,
+    и тест получил бы страницы, закешированные предыдущим тестом.
+    """
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def reload_bad_words_in_place(settings):
+    """Список запрещённых слов перечитывается сразу и в том же потоке."""
+    settings.BAD_WORDS_CHECK_INTERVAL = 0
+    settings.BAD_WORDS_RELOAD_IN_BACKGROUND = False
+
+
 @pytest.fixture
 def news():
     return News.objects.create(title='Заголовок', text='Текст',)
@@ -104,3 +123,17 @@ def comment_edit_url(comment):
 @pytest.fixture
 def comment_delete_url(comment):
     return reverse('news:delete', args=(comment.id,))
+
+
+@pytest.fixture
+def new_bad_word(django_capture_on_commit_callbacks):
+    """
+    Запрещённое слово, добавленное через базу данных.
+
+    Версия списка меняется после фиксации транзакции, поэтому
+    отложенные до фиксации функции выполняются сразу.
+    """
+    with django_capture_on_commit_callbacks(execute=True):
+        bad_word = BadWord.objects.create(word='мерзавец')
+    yield bad_word
+    BadWord.objects.filter(pk=bad_word.pk).delete()
@@ -0,0 +1,152 @@
+import threading
+from http import HTTPStatus
+from unittest import mock
+from urllib.parse import urlencode
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import AsyncClient
+from django.urls import reverse
+
+from news import aio
+from news.connections import connection_stats
+from news.models import Comment
+
+pytestmark = pytest.mark.urls('yanews.asgi_urls')
+
+
+@pytest.fixture
+def db_in_main_thread(settings):
+    """
+    Асинхронные представления обращаются к базе в потоке теста.
+
+    Иначе они открыли бы свои соединения и не увидели данных
+    из незавершённой транзакции теста.
+    """
+    settings.NEWS_ASYNC_DB_THREADS = 0
+
+
+@pytest.fixture
+def async_author_client(author):
+    client = AsyncClient()
+    client.force_login(author)
+    return client
+
+
+def get(client, url, **extra):
+    async def request():
+        return await client.get(url, **extra)
+    return async_to_sync(request)()
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('db_in_main_thread', 'some_news')
+@pytest.mark.parametrize(
+    'parametrized_client',
+    (
+        pytest.lazy_fixture('async_client'),
+        pytest.lazy_fixture('async_author_client'),
+    ),
+)
+def test_home_page(parametrized_client):
+    """Главная страница показывает те же новости, что NewsList."""
+    response = get(parametrized_client, reverse('news:home'))
+    assert response.status_code == HTTPStatus.OK
+    object_list = response.context['object_list']
+    assert len(object_list) == settings.NEWS_COUNT_ON_HOME_PAGE
+    dates = [news.date for news in object_list]
+    assert dates == sorted(dates, reverse=True)
+    assert 'Cookie' in response['Vary']
+
+
+@pytest.mark.usefixtures('db_in_main_thread')
+def test_detail_page(async_author_client, news, comment):
+    url = reverse('news:detail', args=(news.pk,))
+    response = get(async_author_client, url)
+    assert response.status_code == HTTPStatus.OK
+    assert response.context['news'] == news
+    assert list(response.context['comments']) == [comment]
+    assert 'form' in response.context
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('db_in_main_thread')
+def test_detail_page_not_found(async_client):
+    response = get(async_client, reverse('news:detail', args=(1,)))
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('db_in_main_thread')
+def test_not_modified(async_client, news):
+    """Условные запросы обрабатываются так же, как у NewsDetail."""
+    url = reverse('news:detail', args=(news.pk,))
+    response = get(async_client, url)
+    assert response.has_header('Last-Modified')
+    response = get(async_client, url, **{'If-None-Match': response['ETag']})
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+@pytest.mark.usefixtures('db_in_main_thread')
+def test_comment_is_posted(async_author_client, news):
+    """POST на страницу новости добавляет комментарий."""
+    url = reverse('news:detail', args=(news.pk,))
+
+    async def post():
+        # AsyncClient в Django 3.2 не дочитывает multipart, поэтому
+        # форма отправляется как application/x-www-form-urlencoded.
+        return await async_author_client.post(
+            url,
+            data=urlencode({'text': 'Текст комментария'}),
+            content_type='application/x-www-form-urlencoded',
+        )
+
+    response = async_to_sync(post)()
+    assert response.status_code == HTTPStatus.FOUND
+    assert Comment.objects.get().text == 'Текст комментария'
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('threads, in_pool', ((0, False), (2, True)))
+def test_queries_run_in_pool(settings, threads, in_pool):
+    """Синхронный код выполняется в пуле, если он задан в настройках."""
+    settings.NEWS_ASYNC_DB_THREADS = threads
+    thread = async_to_sync(aio.run(threading.current_thread))()
+    assert thread.name.startswith('news-db') is in_pool
+
+
+@pytest.mark.django_db(transaction=True)
+def test_pages_are_served_from_pool(async_author_client, comment, news):
+    """
+    С пулом по умолчанию страницы формируются в потоках пула
+    с их собственными соединениями, и эти соединения видны в db_stats.
+    """
+    assert settings.NEWS_ASYNC_DB_THREADS
+    opened = connection_stats()['connections_opened']
+    for url in (
+        reverse('news:home'), reverse('news:detail', args=(news.pk,))
+    ):
+        response = get(async_author_client, url)
+        assert response.status_code == HTTPStatus.OK
+        assert str(news.title) in response.content.decode()
+    assert comment.text in response.content.decode()
+    assert connection_stats()['connections_opened'] > opened
+
+
+@pytest.mark.django_db(transaction=True)
+def test_pool_connections_are_health_checked(async_client, news):
+    """
+    Перед работой в потоке пула его соединение проверяется,
+    а неисправное закрывается и учитывается в db_stats.
+    """
+    url = reverse('news:detail', args=(news.pk,))
+    assert get(async_client, url).status_code == HTTPStatus.OK
+    failures = connection_stats()['health_check_failures']
+    connection = connections[DEFAULT_DB_ALIAS]
+    with mock.patch.object(
+        type(connection), 'is_usable', return_value=False
+    ):
+        assert get(async_client, url).status_code == HTTPStatus.OK
+    assert connection_stats()['health_check_failures'] > failures
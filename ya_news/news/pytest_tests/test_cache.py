@@ -0,0 +1,297 @@
+import json
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+
+from news.models import Comment, News
+
+CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.filebased.FileBasedCache',
+)
+
+
+@pytest.fixture(params=CACHE_BACKENDS)
+def cache_backend(request, settings, tmp_path):
+    settings.CACHES = {
+        'default': {
+            'BACKEND': request.param,
+            'LOCATION': str(tmp_path / 'cache'),
+        }
+    }
+    yield request.param
+    cache.clear()
+
+
+@pytest.fixture
+def import_file(tmp_path):
+    path = tmp_path / 'news.jsonl'
+    path.write_text(
+        json.dumps({'title': 'Импорт', 'text': 'Текст'}), encoding='utf-8'
+    )
+    return str(path)
+
+
+@pytest.mark.usefixtures('cache_backend', 'comment')
+def test_anonymous_news_detail_is_cached(
+    client, django_assert_num_queries, news_detail_url
+):
+    """
+    Повторный просмотр новости анонимным пользователем
+    не загружает комментарии: новость и комментарии берутся из кеша.
+    """
+    first_response = client.get(news_detail_url)
+    with django_assert_num_queries(1):
+        second_response = client.get(news_detail_url)
+    assert second_response.content == first_response.content
+
+
+@pytest.mark.parametrize(
+    'url, data, expected_text',
+    (
+        (
+            pytest.lazy_fixture('news_detail_url'),
+            {'text': 'Ещё один комментарий'},
+            'Ещё один комментарий',
+        ),
+        (
+            pytest.lazy_fixture('comment_edit_url'),
+            {'text': 'Исправленный комментарий'},
+            'Исправленный комментарий',
+        ),
+        (
+            pytest.lazy_fixture('comment_delete_url'),
+            {},
+            'Здесь никто ничего не написал...',
+        ),
+    )
+)
+@pytest.mark.usefixtures('cache_backend')
+def test_comment_changes_invalidate_news_detail(
+    author_client, client, comment, data, expected_text, news_detail_url, url
+):
+    """
+    Создание, редактирование и удаление комментария
+    сразу видны анонимному пользователю.
+    """
+    response = client.get(news_detail_url)
+    assert expected_text not in response.content.decode()
+    author_client.post(url, data=data)
+    response = client.get(news_detail_url)
+    assert expected_text in response.content.decode()
+
+
+@pytest.mark.usefixtures('cache_backend')
+def test_author_sees_own_links_after_anonymous_visit(
+    author_client, client, comment_edit_url, news_detail_url, reader_client
+):
+    """
+    Ссылки на редактирование и удаление видит только автор комментария,
+    даже если страница уже закеширована для анонимных пользователей.
+    """
+    client.get(news_detail_url)
+    response = author_client.get(news_detail_url)
+    assert comment_edit_url in response.content.decode()
+    for other_client in (client, reader_client):
+        response = other_client.get(news_detail_url)
+        assert comment_edit_url not in response.content.decode()
+
+
+@pytest.fixture
+def home_url():
+    return reverse('news:home')
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('cache_backend')
+def test_anonymous_home_page_is_cached(
+    client, django_assert_num_queries, home_url, news
+):
+    """
+    Главная страница для анонимных пользователей повторно отдаётся
+    из кеша: из базы читается только её версия, без обращения
+    к таблице новостей.
+    """
+    first_response = client.get(home_url)
+    assert first_response['X-Cache'] == 'MISS'
+    with django_assert_num_queries(1) as captured:
+        second_response = client.get(home_url)
+    assert 'news_news' not in captured.captured_queries[0]['sql']
+    assert second_response['X-Cache'] == 'HIT'
+    assert second_response.content == first_response.content
+    assert 'Cookie' in second_response['Vary']
+
+
+@pytest.mark.django_db
+def test_home_page_cache_is_purged_on_changes(
+    author, client, home_url, news
+):
+    """
+    Новая новость, новый и удалённый комментарий
+    сразу видны на главной странице.
+    """
+    client.get(home_url)
+    new_news = News.objects.create(title='Свежая новость', text='Текст')
+    assert new_news.title in client.get(home_url).content.decode()
+    comment = Comment.objects.create(news=news, author=author, text='Текст')
+    assert 'Комментариев: 1' in client.get(home_url).content.decode()
+    comment.delete()
+    assert 'Комментариев: 1' not in client.get(home_url).content.decode()
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('cache_backend')
+def test_home_page_cache_is_purged_without_signals(
+    client, home_url, import_file, news
+):
+    """
+    Версия страницы берётся из базы, поэтому кеш сбрасывают и записи
+    без сигналов, например новости, загруженные командой import_news.
+    """
+    client.get(home_url)
+    call_command('import_news', import_file, stdout=StringIO())
+    response = client.get(home_url)
+    assert response['X-Cache'] == 'MISS'
+    assert 'Импорт' in response.content.decode()
+
+
+def test_home_page_is_not_cached_for_authorized_user(
+    author, author_client, client, home_url
+):
+    """
+    Авторизованный пользователь не получает страницу,
+    закешированную для анонимных пользователей, и наоборот.
+    """
+    client.get(home_url)
+    response = author_client.get(home_url)
+    assert 'X-Cache' not in response
+    assert author.username in response.content.decode()
+    response = client.get(home_url)
+    assert response['X-Cache'] == 'HIT'
+    assert author.username not in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_stale_home_page_is_served_during_regeneration(
+    client, django_assert_num_queries, home_url, news
+):
+    """
+    Пока один запрос обновляет устаревшую страницу, остальные
+    получают её прежнюю копию: из базы читается только версия.
+    """
+    stale_content = client.get(home_url).content
+    News.objects.create(title='Свежая новость', text='Текст')
+    assert cache.add('news:page_cache:home:lock', True)
+    with django_assert_num_queries(1):
+        response = client.get(home_url)
+    assert response['X-Cache'] == 'STALE'
+    assert response.content == stale_content
+    cache.delete('news:page_cache:home:lock')
+    response = client.get(home_url)
+    assert response['X-Cache'] == 'MISS'
+
+
+@pytest.mark.django_db
+def test_cache_stats(client, home_url):
+    """Счётчики кеша страниц доступны в текстовом формате."""
+    client.get(home_url)
+    client.get(home_url)
+    response = client.get(reverse('news:cache_stats'))
+    content = response.content.decode()
+    assert 'news_page_cache_requests_total{page="home",result="miss"} 1' in (
+        content
+    )
+    assert 'news_page_cache_requests_total{page="home",result="hit"} 1' in (
+        content
+    )
+
+
+@pytest.mark.parametrize(
+    'url',
+    (pytest.lazy_fixture('home_url'), pytest.lazy_fixture('news_detail_url'))
+)
+def test_conditional_get(author, client, news, url):
+    """
+    Главная страница и страница новости отдают ETag и Last-Modified.
+    Пока содержимое не изменилось, повторный запрос получает ответ 304.
+    """
+    response = client.get(url)
+    etag = response['ETag']
+    last_modified = response['Last-Modified']
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    Comment.objects.create(news=news, author=author, text='Текст')
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    assert response['ETag'] != etag
+
+
+@pytest.mark.parametrize(
+    'url',
+    (pytest.lazy_fixture('home_url'), pytest.lazy_fixture('news_detail_url'))
+)
+def test_etag_depends_on_user(author_client, client, reader_client, url):
+    """
+    Разные пользователи получают разные ETag,
+    а авторизованным не отдаётся Last-Modified.
+    """
+    responses = [
+        some_client.get(url)
+        for some_client in (client, author_client, reader_client)
+    ]
+    assert len({response['ETag'] for response in responses}) == 3
+    assert all('Last-Modified' not in response for response in responses[1:])
+
+
+def test_news_etag_changes_with_csrf_token(author, author_client,
+                                           news_detail_url):
+    """
+    После повторного входа CSRF-токен меняется, поэтому страница новости
+    с формой комментария отдаётся заново, а не ответом 304.
+    """
+    # Первый ответ устанавливает CSRF-cookie.
+    author_client.get(news_detail_url)
+    etag = author_client.get(news_detail_url)['ETag']
+    response = author_client.get(news_detail_url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    author_client.logout()
+    author_client.force_login(author)
+    response = author_client.get(news_detail_url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    assert response['ETag'] != etag
+
+
+@pytest.mark.parametrize(
+    'url',
+    (pytest.lazy_fixture('home_url'), pytest.lazy_fixture('news_detail_url'))
+)
+@pytest.mark.django_db
+def test_validators_do_not_depend_on_cache(client, news, url):
+    """
+    Значения ETag и Last-Modified считаются по базе, а не по кешу процесса,
+    поэтому другой процесс с пустым кешем отдаёт те же значения.
+    """
+    response = client.get(url)
+    cache.clear()
+    second_response = client.get(url)
+    for header in ('ETag', 'Last-Modified'):
+        assert second_response[header] == response[header]
+
+
+@pytest.mark.django_db
+def test_home_etag_changes_on_bulk_insert(client, home_url, import_file):
+    """
+    Новости, добавленные без сигналов, например командой import_news,
+    меняют ETag главной страницы.
+    """
+    etag = client.get(home_url)['ETag']
+    call_command('import_news', import_file, stdout=StringIO())
+    response = client.get(home_url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    assert response['ETag'] != etag
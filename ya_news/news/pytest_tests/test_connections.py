@@ -0,0 +1,54 @@
+from unittest import mock
+
+import pytest
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.urls import reverse
+
+from news.connections import check_connections, connection_stats
+
+pytestmark = pytest.mark.django_db
+
+
+def test_requests_are_counted(client):
+    """Каждый запрос учитывается в счётчиках соединений."""
+    before = connection_stats()['requests']
+    client.get(reverse('news:home'))
+    assert connection_stats()['requests'] == before + 1
+
+
+@pytest.mark.parametrize('usable', (True, False))
+def test_health_check_closes_broken_connection(usable):
+    """Перед запросом закрывается только неисправное соединение."""
+    connection = connections[DEFAULT_DB_ALIAS]
+    connection.ensure_connection()
+    before = connection_stats()['health_check_failures']
+    with mock.patch.object(
+        type(connection), 'is_usable', return_value=usable
+    ), mock.patch.object(type(connection), 'close') as close:
+        check_connections()
+    assert close.called is not usable
+    assert connection_stats()['health_check_failures'] == (
+        before + (not usable)
+    )
+
+
+def test_health_check_can_be_disabled(settings):
+    """Без CONN_HEALTH_CHECKS соединение не проверяется."""
+    connection = connections[DEFAULT_DB_ALIAS]
+    connection.ensure_connection()
+    with mock.patch.dict(
+        connection.settings_dict, CONN_HEALTH_CHECKS=False
+    ), mock.patch.object(type(connection), 'is_usable') as is_usable:
+        check_connections()
+    is_usable.assert_not_called()
+
+
+def test_db_stats(client):
+    """Счётчики соединений отдаются в формате Prometheus."""
+    response = client.get(reverse('news:db_stats'))
+    lines = response.content.decode().splitlines()
+    assert [line.split()[0] for line in lines] == [
+        'db_requests_total',
+        'db_connections_opened_total',
+        'db_connection_health_check_failures_total',
+    ]
@@ -35,6 +35,28 @@ def test_news_order(client):
     assert all_dates == sorted_dates
 
 
+@pytest.mark.usefixtures('some_comments')
+def test_home_page_counts_comments_in_single_query(
+    client, django_assert_num_queries, news
+):
+    """
+    Главная страница формируется двумя запросами к базе данных:
+    версия страницы и список новостей. Комментарии не загружаются,
+    для новости выводится только их количество.
+    """
+    comments_count = news.comment_set.count()
+    url = reverse('news:home')
+    with django_assert_num_queries(2) as captured:
+        response = client.get(url)
+    assert all(
+        'news_comment' not in query['sql']
+        for query in captured.captured_queries
+    )
+    object_list = response.context['object_list']
+    assert object_list[0].comment_count == comments_count
+    assert f'Комментариев: {comments_count}' in response.content.decode()
+
+
 @pytest.mark.usefixtures('some_comments')
 def test_comments_order(client, news_detail_url):
     """
@@ -43,14 +65,80 @@ def test_comments_order(client, news_detail_url):
     старые в начале списка, новые — в конце.
     """
     response = client.get(news_detail_url)
-    assert 'news' in response.context
-    news = response.context['news']
-    all_comments = news.comment_set.all()
+    assert 'comments' in response.context
+    all_comments = response.context['comments']
     all_timestamps = [comment.created for comment in all_comments]
     sorted_timestamps = sorted(all_timestamps)
     assert all_timestamps == sorted_timestamps
 
 
+@pytest.mark.usefixtures('some_comments')
+def test_comments_are_paginated_by_cursor(
+    client, django_assert_max_num_queries, news, news_detail_url, settings
+):
+    """
+    Комментарии выводятся постранично.
+    Страницы выбираются по курсору, без OFFSET, и вместе содержат
+    все комментарии к новости в хронологическом порядке.
+    """
+    settings.COMMENTS_COUNT_ON_NEWS_PAGE = 3
+    url = news_detail_url
+    shown_comments = []
+    while True:
+        with django_assert_max_num_queries(2) as captured:
+            response = client.get(url)
+            comments = response.context['comments']
+            shown_comments += list(comments)
+        assert len(comments) <= settings.COMMENTS_COUNT_ON_NEWS_PAGE
+        assert all(
+            'OFFSET' not in query['sql']
+            for query in captured.captured_queries
+        )
+        if not comments.has_next:
+            break
+        url = f'{news_detail_url}?after={comments.next_cursor}'
+    assert shown_comments == list(news.comment_set.order_by('created', 'pk'))
+    response = client.get(
+        f'{news_detail_url}?before={comments.previous_cursor}'
+    )
+    previous_comments = list(response.context['comments'])
+    assert previous_comments == shown_comments[
+        -len(comments) - settings.COMMENTS_COUNT_ON_NEWS_PAGE:-len(comments)
+    ]
+
+
+@pytest.mark.usefixtures('some_comments')
+@pytest.mark.parametrize(
+    'name',
+    ('client', 'author_client')
+)
+@pytest.mark.parametrize(
+    'cursor',
+    (
+        'x', '1', '1-x', '-1-1', '1-0', '²-1', '1-²',
+        '99999999999999999999-1', '1-' + '9' * 20, '1-' + '9' * 5000,
+        f'1-{2 ** 63}',
+    )
+)
+@pytest.mark.parametrize('direction', ('after', 'before'))
+def test_invalid_cursor_shows_first_page(
+    request, name, cursor, direction, news, news_detail_url
+):
+    """
+    Некорректный курсор и курсор вне допустимых границ не приводят
+    к ошибке: выводится первая страница комментариев.
+    """
+    response = request.getfixturevalue(name).get(
+        news_detail_url, {direction: cursor}
+    )
+    assert response.status_code == 200
+    assert list(response.context['comments']) == list(
+        news.comment_set.order_by('created', 'pk')[
+            :settings.COMMENTS_COUNT_ON_NEWS_PAGE
+        ]
+    )
+
+
 @pytest.mark.django_db
 def test_anonymous_client_has_no_form(client, news_detail_url):
     """
@@ -0,0 +1,116 @@
+import csv
+import json
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from news.models import Comment, News
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def moderated_comments(author, reader, news):
+    """Комментарии двух авторов к двум новостям за последние дни."""
+    other_news = News.objects.create(title='Другая', text='Текст')
+    now = timezone.now()
+    comments = []
+    for index, (comment_news, comment_author) in enumerate((
+        (news, author), (news, reader), (other_news, author),
+        (other_news, reader), (news, author),
+    )):
+        comment = Comment.objects.create(
+            news=comment_news, author=comment_author, text=f'Текст {index}'
+        )
+        comment.created = now - timedelta(days=index)
+        comment.save()
+        comments.append(comment)
+    return comments
+
+
+def export_comments(*args, **options):
+    stdout = StringIO()
+    call_command(
+        'export_comments', *args, stdout=stdout, stderr=StringIO(), **options
+    )
+    return stdout.getvalue()
+
+
+def test_command_exports_csv_with_authors(moderated_comments):
+    """Команда выгружает все комментарии по порядку id с именами авторов."""
+    rows = list(csv.DictReader(StringIO(export_comments(chunk_size=2))))
+    assert [int(row['id']) for row in rows] == [
+        comment.pk for comment in moderated_comments
+    ]
+    assert [row['author'] for row in rows] == [
+        comment.author.username for comment in moderated_comments
+    ]
+
+
+def test_command_filters(author, moderated_comments, news):
+    """Выгрузку можно ограничить новостью, автором и диапазоном дат."""
+    output = export_comments(
+        '--since', str(timezone.localdate() - timedelta(days=3)),
+        format='jsonl',
+        news=news.pk,
+        author=author.username,
+    )
+    exported = [json.loads(line)['id'] for line in output.splitlines()]
+    assert exported == [moderated_comments[0].pk]
+    output = export_comments(
+        '--until', str(timezone.localdate() - timedelta(days=1)),
+        format='jsonl',
+    )
+    exported = [json.loads(line)['id'] for line in output.splitlines()]
+    assert exported == [comment.pk for comment in moderated_comments[1:]]
+
+
+def test_command_resumes_after_cursor(moderated_comments, tmp_path):
+    """
+    С курсором --after выгрузка продолжается со следующего комментария
+    и дописывает тот же файл без повторного заголовка.
+    """
+    path = tmp_path / 'comments.csv'
+    stderr = StringIO()
+    call_command(
+        'export_comments', output=str(path),
+        news=moderated_comments[0].news_id, stderr=stderr
+    )
+    cursor = int(stderr.getvalue().rsplit(' ', 1)[1])
+    assert cursor == moderated_comments[-1].pk
+    Comment.objects.filter(pk__gt=moderated_comments[1].pk).delete()
+    call_command(
+        'export_comments', output=str(path), after=moderated_comments[0].pk,
+        stderr=StringIO()
+    )
+    rows = list(csv.DictReader(path.open(encoding='utf-8')))
+    assert [int(row['id']) for row in rows] == [
+        moderated_comments[0].pk, moderated_comments[1].pk,
+        moderated_comments[4].pk, moderated_comments[1].pk,
+    ]
+
+
+@pytest.mark.parametrize('file_format', ('csv', 'jsonl'))
+def test_admin_action_streams_selected_comments(
+    admin_client, file_format, moderated_comments
+):
+    """Действие в админке отдаёт выбранные комментарии потоком."""
+    selected = moderated_comments[:2]
+    response = admin_client.post(
+        reverse('admin:news_comment_changelist'),
+        {
+            'action': f'export_{file_format}',
+            '_selected_action': [comment.pk for comment in selected],
+        }
+    )
+    assert response.streaming
+    content = b''.join(response.streaming_content).decode()
+    if file_format == 'csv':
+        ids = [int(row['id']) for row in csv.DictReader(StringIO(content))]
+    else:
+        ids = [json.loads(line)['id'] for line in content.splitlines()]
+    assert ids == [comment.pk for comment in selected]
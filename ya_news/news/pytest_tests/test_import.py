@@ -0,0 +1,121 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from news.models import News
+from news.search import search_news
+
+pytestmark = pytest.mark.django_db
+
+RECORDS = [
+    {'title': f'Новость {index}', 'text': f'Текст новости номер {index}'}
+    for index in range(7)
+]
+
+
+@pytest.fixture
+def jsonl_file(tmp_path):
+    path = tmp_path / 'news.jsonl'
+    path.write_text(
+        '\n'.join(
+            json.dumps(record, ensure_ascii=False) for record in RECORDS
+        ),
+        encoding='utf-8'
+    )
+    return path
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / 'news.csv'
+    path.write_text(
+        'title,text,date\n'
+        'Первая,"Текст, с запятой",2022-01-31\n'
+        'Вторая,Текст,\n',
+        encoding='utf-8'
+    )
+    return path
+
+
+def import_news(*args, **options):
+    stdout = StringIO()
+    call_command('import_news', *args, stdout=stdout, **options)
+    return stdout.getvalue()
+
+
+def test_import_jsonl_in_batches(jsonl_file):
+    """
+    Новости из JSONL сохраняются порциями, о каждой выводится отчёт
+    со скоростью загрузки, и новости сразу доступны в поиске.
+    """
+    output = import_news(
+        str(jsonl_file), batch_size=2, transaction_size=3
+    )
+    assert list(
+        News.objects.order_by('pk').values('title', 'text')
+    ) == RECORDS
+    assert output.count('строк/с') == 3
+    assert len(search_news('номер', offset=0, limit=10)) == len(RECORDS)
+
+
+def test_import_csv(csv_file):
+    """Новости загружаются из CSV, дата необязательна."""
+    import_news(str(csv_file))
+    first, second = News.objects.order_by('pk')
+    assert (first.title, first.text, str(first.date)) == (
+        'Первая', 'Текст, с запятой', '2022-01-31'
+    )
+    assert second.date is not None
+
+
+def test_import_resumes_from_offset(jsonl_file):
+    """С --offset загрузка продолжается с указанной записи."""
+    import_news(str(jsonl_file), offset=5)
+    assert list(
+        News.objects.order_by('pk').values_list('title', flat=True)
+    ) == ['Новость 5', 'Новость 6']
+
+
+def test_invalid_record_reports_resume_offset(jsonl_file):
+    """
+    На некорректной записи загрузка останавливается.
+    Сохранённые порции остаются в базе, а в ошибке указан --offset,
+    с которого загрузку можно продолжить.
+    """
+    with open(jsonl_file, 'a', encoding='utf-8') as file:
+        file.write('\n{"title": "Без текста"}\n')
+    with pytest.raises(CommandError, match='--offset 6'):
+        import_news(str(jsonl_file), transaction_size=3)
+    assert News.objects.count() == 6
+
+
+@pytest.mark.parametrize(
+    'line, message',
+    (
+        ('[1, 2]', 'Запись 8: ожидался объект'),
+        ('"Новость"', 'Запись 8: ожидался объект'),
+        ('{"title": 5, "text": "Текст"}', 'Запись 8: поле title'),
+        ('{"title": "Новость", "text": ["Текст"]}', 'Запись 8: поле text'),
+        ('{"title": "Новость", "text": "Текст", "date": 1}', 'поле date'),
+    )
+)
+def test_malformed_record_reports_resume_offset(jsonl_file, line, message):
+    """
+    Запись неверного типа останавливает загрузку с понятной ошибкой
+    и --offset, с которого загрузку можно продолжить.
+    """
+    with open(jsonl_file, 'a', encoding='utf-8') as file:
+        file.write(f'\n{line}\n')
+    with pytest.raises(CommandError, match=f'{message}.*--offset 6'):
+        import_news(str(jsonl_file), transaction_size=3)
+    assert News.objects.count() == 6
+
+
+def test_unknown_format_is_rejected(tmp_path):
+    """Формат файла без известного расширения нужно указать явно."""
+    path = tmp_path / 'news.txt'
+    path.write_text('', encoding='utf-8')
+    with pytest.raises(CommandError, match='--format'):
+        import_news(str(path))
@@ -0,0 +1,44 @@
+import pytest
+from django.conf import settings
+from django.db import connection
+
+from news.models import Comment, News
+from news.pagination import CommentPage, encode_cursor
+
+pytestmark = pytest.mark.skipif(
+    connection.vendor != 'sqlite',
+    reason='План запроса проверяется только для SQLite.'
+)
+
+
+def assert_uses_index(queryset):
+    """
+    План запроса не содержит полного просмотра таблицы
+    и сортировки во временном B-дереве.
+    """
+    plan = queryset.explain()
+    assert 'TEMP B-TREE' not in plan, plan
+    for line in plan.splitlines():
+        if 'SCAN' in line:
+            assert 'USING' in line, plan
+
+
+@pytest.mark.django_db
+def test_home_page_uses_date_index():
+    """Новости главной страницы выбираются по индексу на дату."""
+    assert_uses_index(News.objects.all()[:settings.NEWS_COUNT_ON_HOME_PAGE])
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('cursor', (None, 'after', 'before'))
+def test_comments_page_uses_news_created_index(news, comment, cursor):
+    """Любая страница комментариев выбирается по индексу (news, created)."""
+    kwargs = {}
+    if cursor:
+        kwargs[cursor] = encode_cursor(comment.created, comment.pk)
+    assert_uses_index(CommentPage(news, **kwargs).get_queryset())
+
+
+def test_author_comments_use_index(author):
+    """Комментарии автора выбираются по индексу."""
+    assert_uses_index(Comment.objects.filter(author=author))
@@ -1,10 +1,19 @@
+import threading
+import time
+from datetime import timedelta
 from http import HTTPStatus
+from io import StringIO
 
 import pytest
+from django.core.management import call_command
+from django.db.models import F
 from pytest_django.asserts import assertFormError, assertRedirects
 
-from news.forms import BAD_WORDS, WARNING
-from news.models import Comment
+from news.forms import BAD_WORDS, WARNING, bad_words_matcher
+from news.models import BadWord, Comment, News
+from news.moderation import (
+    ReloadingBadWordsMatcher, get_bad_words_version
+)
 
 
 @pytest.mark.django_db
@@ -29,6 +38,25 @@ def test_user_can_create_comment(
     assert comment.author == author
 
 
+@pytest.mark.usefixtures('some_comments')
+def test_new_comment_redirects_to_its_page(
+    author_client, form_data, news_detail_url, settings
+):
+    """
+    После отправки комментария пользователь попадает
+    на страницу комментариев, где находится его комментарий.
+    """
+    settings.COMMENTS_COUNT_ON_NEWS_PAGE = 3
+    Comment.objects.update(created=F('created') - timedelta(days=30))
+    response = author_client.post(news_detail_url, data=form_data)
+    new_comment = Comment.objects.latest('created')
+    assert '?after=' in response.url
+    response = author_client.get(response.url)
+    comments = list(response.context['comments'])
+    assert comments[-1] == new_comment
+    assert len(comments) == settings.COMMENTS_COUNT_ON_NEWS_PAGE
+
+
 @pytest.mark.parametrize(
     'bad_word',
     BAD_WORDS,
@@ -49,6 +77,87 @@ def test_user_cant_use_bad_words(author_client, bad_word, news_detail_url):
     assert Comment.objects.count() == 0
 
 
+@pytest.mark.parametrize(
+    'text, is_rejected',
+    (
+        ('Сам ты РЕДИСКА!', True),
+        ('Ну и негодяйка', True),
+        ('Сам ты рeдиcкa', True),
+        ('Сам ты нeг0дяй', True),
+        ('Нередиска это не ругательство', False),
+    )
+)
+def test_bad_words_are_found_in_any_form(
+    author_client, is_rejected, news_detail_url, text
+):
+    """
+    Запрещённые слова находятся в любом регистре, с окончаниями
+    и с латинскими буквами вместо похожих кириллических.
+    Основа ищется только в начале слова.
+    """
+    response = author_client.post(news_detail_url, data={'text': text})
+    if is_rejected:
+        assertFormError(response, 'form', 'text', errors=WARNING)
+    assert Comment.objects.exists() is not is_rejected
+
+
+def test_bad_words_are_read_from_database(
+    author_client, new_bad_word, news_detail_url
+):
+    """
+    Слово, добавленное в список запрещённых через базу данных,
+    сразу учитывается при проверке комментариев.
+    """
+    bad_words_data = {'text': f'Ах ты {new_bad_word.word}!'}
+    response = author_client.post(news_detail_url, data=bad_words_data)
+    assertFormError(response, 'form', 'text', errors=WARNING)
+    assert Comment.objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_bad_words_version_changes_after_commit(
+    django_capture_on_commit_callbacks
+):
+    """
+    Версия списка запрещённых слов хранится в базе данных
+    и меняется только после фиксации транзакции.
+    """
+    version = get_bad_words_version()
+    with django_capture_on_commit_callbacks() as callbacks:
+        BadWord.objects.create(word='мерзавец')
+        assert get_bad_words_version() == version
+    for callback in callbacks:
+        callback()
+    assert get_bad_words_version() == version + 1
+
+
+@pytest.mark.django_db
+def test_bad_words_reload_does_not_block_checks(settings):
+    """
+    Пока новый список запрещённых слов собирается в фоне,
+    комментарии проверяются по прежнему списку без ожидания.
+    """
+    settings.BAD_WORDS_RELOAD_IN_BACKGROUND = True
+    loader_started = threading.Event()
+    release_loader = threading.Event()
+
+    def slow_loader():
+        loader_started.set()
+        release_loader.wait(timeout=5)
+        return ['мерзавец']
+
+    matcher = ReloadingBadWordsMatcher(BAD_WORDS, loader=slow_loader)
+    assert matcher.found_in(BAD_WORDS[0])
+    assert loader_started.wait(timeout=5)
+    assert not matcher.found_in('мерзавец')
+    release_loader.set()
+    deadline = time.monotonic() + 5
+    while not matcher.found_in('мерзавец'):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert not matcher.found_in(BAD_WORDS[0])
+
+
 def test_author_can_delete_comment(
     author_client, comment_delete_url, url_to_comments
 ):
@@ -102,3 +211,68 @@ def test_user_cant_edit_comment_of_another_user(
     assert comment.text == initial_comment_text
     assert comment.news == news
     assert comment.author == author
+
+
+def test_comment_count_follows_creating_and_deleting(
+    author_client, comment_delete_url, form_data, news, news_detail_url
+):
+    """
+    Счётчик комментариев новости увеличивается при создании комментария
+    и уменьшается при его удалении.
+    """
+    news.refresh_from_db()
+    assert news.comment_count == 1
+    author_client.post(news_detail_url, data=form_data)
+    news.refresh_from_db()
+    assert news.comment_count == 2
+    author_client.delete(comment_delete_url)
+    news.refresh_from_db()
+    assert news.comment_count == 1
+
+
+@pytest.mark.usefixtures('some_comments')
+def test_recount_comments_command(news):
+    """
+    Команда recount_comments восстанавливает счётчики комментариев
+    и меняет время изменения исправленных новостей.
+    """
+    News.objects.update(comment_count=0)
+    news.refresh_from_db()
+    modified = news.modified
+    call_command('recount_comments', stdout=StringIO())
+    news.refresh_from_db()
+    assert news.comment_count == news.comment_set.count() > 0
+    assert news.modified > modified
+
+
+@pytest.mark.parametrize(
+    'url, expected_queries',
+    (
+        # Сессия, пользователь, новость, создание комментария,
+        # версия главной страницы, счётчик комментариев и время
+        # изменения новости, поисковый индекс, курсор страницы
+        # с комментарием.
+        (pytest.lazy_fixture('news_detail_url'), 8),
+        # Сессия, пользователь, комментарий, сохранение,
+        # время изменения новости, поисковый индекс.
+        (pytest.lazy_fixture('comment_edit_url'), 6),
+        # Сессия, пользователь, комментарий, удаление,
+        # версия главной страницы, счётчик комментариев и время
+        # изменения новости, поисковый индекс.
+        (pytest.lazy_fixture('comment_delete_url'), 7),
+    )
+)
+def test_comment_views_query_count(
+    author_client, comment, django_assert_num_queries, expected_queries,
+    form_data, settings, url
+):
+    """
+    Создание, редактирование и удаление комментария
+    не загружают повторно уже полученные объекты.
+    """
+    bad_words_matcher.check_version()
+    # Версия списка запрещённых слов в этом тесте не сверяется.
+    settings.BAD_WORDS_CHECK_INTERVAL = 60
+    with django_assert_num_queries(expected_queries):
+        response = author_client.post(url, data=form_data)
+    assert response.status_code == HTTPStatus.FOUND
@@ -0,0 +1,109 @@
+import sqlite3
+
+import pytest
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.urls import reverse
+
+from news.models import Comment, News
+from news.routers import PRIMARY_PIN_COOKIE
+
+REPLICA = 'replica'
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+@pytest.fixture
+def replicate(tmp_path, settings):
+    """
+    Реплика основной базы в отдельном файле SQLite.
+
+    Фикстура возвращает функцию, которая копирует в реплику текущее
+    состояние основной базы, — так тест управляет отставанием реплики.
+    """
+    connections.settings[REPLICA] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': str(tmp_path / 'replica.sqlite3'),
+    }
+    settings.NEWS_READ_REPLICAS = [REPLICA]
+
+    def copy():
+        connections[REPLICA].close()
+        primary = connections[DEFAULT_DB_ALIAS]
+        primary.ensure_connection()
+        target = sqlite3.connect(connections.settings[REPLICA]['NAME'])
+        try:
+            primary.connection.backup(target)
+        finally:
+            target.close()
+
+    copy()
+    yield copy
+    connections[REPLICA].close()
+    del connections[REPLICA]
+    del connections.settings[REPLICA]
+
+
+def test_read_views_use_replica(replicate, client, news):
+    """Главная и страница новости читаются с реплики."""
+    News.objects.create(title='Ещё не на реплике', text='Текст')
+    response = client.get(reverse('news:home'))
+    assert list(response.context['object_list']) == []
+    response = client.get(reverse('news:detail', args=(news.pk,)))
+    assert response.status_code == 404
+    replicate()
+    response = client.get(reverse('news:detail', args=(news.pk,)))
+    assert response.context['object'].title == news.title
+
+
+def test_other_views_use_primary(replicate, author, author_client, news):
+    """Представления без replica_reads читают из основной базы."""
+    comment = Comment.objects.create(news=news, author=author, text='Текст')
+    url = reverse('news:edit', args=(comment.pk,))
+    assert author_client.get(url).status_code == 200
+
+
+def test_writer_reads_primary(
+        replicate, author, author_client, reader_client, news
+):
+    """Автор сразу видит свой комментарий, другие — когда догонит реплика."""
+    replicate()
+    url = reverse('news:detail', args=(news.pk,))
+    author_client.post(url, data={'text': 'Новый комментарий'})
+    assert Comment.objects.count() == 1
+    for client, visible in ((author_client, True), (reader_client, False)):
+        comments = list(client.get(url).context['comments'])
+        assert bool(comments) is visible
+    del author_client.cookies[PRIMARY_PIN_COOKIE]
+    assert list(author_client.get(url).context['comments']) == []
+    replicate()
+    assert len(reader_client.get(url).context['comments']) == 1
+
+
+def test_forged_pin_is_ignored(replicate, author, author_client, news):
+    """Cookie без верной подписи не переключает чтение на основную базу."""
+    replicate()
+    Comment.objects.create(news=news, author=author, text='Текст')
+    author_client.cookies[PRIMARY_PIN_COOKIE] = str(author.pk)
+    url = reverse('news:detail', args=(news.pk,))
+    assert list(author_client.get(url).context['comments']) == []
+
+
+def test_replica_pages_are_cached_under_replica_version(
+        replicate, client, news
+):
+    """
+    Страница, прочитанная с отстающей реплики, не остаётся в кеше
+    после того, как реплика догонит основную базу.
+    """
+    url = reverse('news:home')
+    client.get(url)
+    News.objects.create(title='Свежая новость', text='Текст')
+    assert 'Свежая новость' not in client.get(url).content.decode()
+    replicate()
+    assert 'Свежая новость' in client.get(url).content.decode()
+
+
+def test_routing_outside_requests(replicate, news):
+    """Вне HTTP-запроса всё читается из основной базы."""
+    assert News.objects.get().pk == news.pk
+    assert News.objects.db == DEFAULT_DB_ALIAS
@@ -10,6 +10,7 @@ from pytest_django.asserts import assertRedirects
     'name, args',
     (
         ('news:home', None),
+        ('news:search', None),
         ('news:detail', pytest.lazy_fixture('news_id')),
         ('users:login', None),
         ('users:logout', None),
@@ -18,7 +19,7 @@ from pytest_django.asserts import assertRedirects
 )
 def test_pages_availability_for_anonymous_user(args, client, name):
     """
-    Главная страница, страница отдельной новости,
+    Главная страница, страница поиска, страница отдельной новости,
     страницы регистрации пользователей, входа в учётную запись и выхода из неё
     доступны анонимным пользователям.
     """
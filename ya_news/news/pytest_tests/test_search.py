@@ -0,0 +1,116 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from news.models import Comment, News
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def search_url():
+    return reverse('news:search')
+
+
+@pytest.fixture
+def search(client, search_url):
+    def search(query, **params):
+        response = client.get(search_url, {'q': query, **params})
+        return list(response.context['object_list'])
+    return search
+
+
+@pytest.fixture
+def sport_news():
+    return News.objects.create(
+        title='Новости спорта', text='Сборная выиграла матч.'
+    )
+
+
+@pytest.fixture
+def weather_news(author):
+    news = News.objects.create(title='Погода', text='Завтра дождь.')
+    Comment.objects.create(
+        news=news, author=author, text='Зонтик спасёт от любых новостей'
+    )
+    return news
+
+
+def test_search_uses_russian_stemming(search, sport_news):
+    """Новость находится по другим формам слов из заголовка и текста."""
+    assert search('новостям') == [sport_news]
+    assert search('выиграли сборной') == [sport_news]
+
+
+@pytest.mark.usefixtures('weather_news')
+def test_title_match_ranks_above_comment_match(
+    search, sport_news, weather_news
+):
+    """
+    Новость находится и по тексту комментария к ней.
+    Совпадение в заголовке выводится выше совпадения в комментарии.
+    """
+    assert search('новость') == [sport_news, weather_news]
+    assert search('зонтик') == [weather_news]
+
+
+def test_search_index_follows_changes(search, sport_news, weather_news):
+    """Индекс обновляется при изменении и удалении новостей и комментариев."""
+    sport_news.title = 'Спорт'
+    sport_news.save()
+    assert search('новости') == [weather_news]
+    weather_news.comment_set.all().delete()
+    assert search('новости') == []
+    sport_news.delete()
+    assert search('спорт') == []
+
+
+@pytest.mark.usefixtures('some_news')
+def test_rebuild_command_indexes_bulk_created_news(search, settings):
+    """
+    Новости, созданные в обход сигналов, попадают в поиск
+    после команды rebuild_search_index.
+    """
+    settings.NEWS_COUNT_ON_SEARCH_PAGE = News.objects.count()
+    assert search('просто текст') == []
+    call_command('rebuild_search_index', batch_size=3, stdout=StringIO())
+    assert len(search('просто текст')) == News.objects.count()
+
+
+@pytest.mark.usefixtures('weather_news')
+def test_search_is_paginated(search, settings, sport_news, weather_news):
+    """Результаты поиска выводятся постранично."""
+    settings.NEWS_COUNT_ON_SEARCH_PAGE = 1
+    assert search('новость', page=1) == [sport_news]
+    assert search('новость', page=2) == [weather_news]
+    assert search('новость', page=3) == []
+
+
+@pytest.mark.parametrize(
+    'page, expected',
+    (
+        ('0', 1), ('-1', 1), ('x', 1), ('²', 1), ('6', 5),
+        ('9' * 30, 5), ('9' * 5000, 5),
+    )
+)
+def test_search_page_is_clamped(client, expected, page, search_url, settings):
+    """
+    Номер страницы вне допустимых пределов не вызывает ошибку,
+    слишком большой заменяется последним допустимым.
+    """
+    settings.NEWS_SEARCH_MAX_PAGE = 5
+    response = client.get(search_url, {'q': 'новость', 'page': page})
+    assert response.status_code == HTTPStatus.OK
+    assert response.context['page_number'] == expected
+
+
+@pytest.mark.parametrize(
+    'query', ('"', 'спорт OR', 'NEAR(', 'news_id:1', '*', '')
+)
+def test_query_syntax_is_not_interpreted(client, query, search_url):
+    """Служебный синтаксис FTS5 в запросе не вызывает ошибок."""
+    response = client.get(search_url, {'q': query})
+    assert response.status_code == HTTPStatus.OK
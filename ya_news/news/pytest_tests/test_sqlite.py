@@ -0,0 +1,38 @@
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+
+from news.sqlite import apply_pragmas
+
+pytestmark = pytest.mark.django_db
+
+# Значения, которые SQLite возвращает для профиля из настроек.
+EXPECTED_PRAGMAS = {
+    'synchronous': 1,
+    'busy_timeout': 5000,
+    'cache_size': -64 * 1024,
+    'temp_store': 2,
+}
+
+
+def read_pragma(name):
+    with connection.cursor() as cursor:
+        cursor.execute(f'PRAGMA {name}')
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.parametrize('name, value', EXPECTED_PRAGMAS.items())
+def test_connection_uses_pragma_profile(name, value):
+    """Соединение с базой получает PRAGMA из SQLITE_PRAGMAS."""
+    assert read_pragma(name) == value
+
+
+@pytest.mark.parametrize(
+    'pragmas',
+    ({'synchronous; DROP TABLE news_news': 'OFF'},
+     {'synchronous': 'OFF; DROP TABLE news_news'})
+)
+def test_invalid_pragma_is_rejected(pragmas):
+    """Некорректное имя или значение PRAGMA не попадает в SQL."""
+    with pytest.raises(ImproperlyConfigured):
+        apply_pragmas(connection, pragmas)
@@ -0,0 +1,24 @@
+import pytest
+from django.core.management import CommandError, call_command
+from django.template import engines
+
+from yanews.settings_production import TEMPLATES as PRODUCTION_TEMPLATES
+
+
+def test_precompile_templates(settings, capsys):
+    """Команда разбирает шаблоны проекта и кеширует их."""
+    settings.TEMPLATES = PRODUCTION_TEMPLATES
+    call_command('precompile_templates')
+    assert 'Разобрано шаблонов' in capsys.readouterr().out
+    cached = engines['django'].engine.template_loaders[0]
+    assert 'news/detail.html' in cached.get_template_cache
+
+
+def test_precompile_templates_fails_on_syntax_error(settings, tmp_path):
+    """Синтаксическая ошибка в шаблоне останавливает команду."""
+    (tmp_path / 'broken.html').write_text('{% if %}', encoding='utf-8')
+    settings.TEMPLATES = [
+        {**settings.TEMPLATES[0], 'DIRS': [tmp_path]}
+    ]
+    with pytest.raises(CommandError, match='broken.html'):
+        call_command('precompile_templates')
@@ -0,0 +1,92 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+PRIMARY_PIN_COOKIE = 'news_primary_pin'
+
+# Состояние маршрутизации текущего HTTP-запроса. Переменная контекста,
+# а не threading.local: под ASGI запросы обслуживаются и в потоках,
+# и в цикле событий, и у каждого запроса должен быть свой контекст.
+routing_state = ContextVar('news_routing_state', default=None)
+
+
+class RoutingState:
+    """
+    Куда идут чтения в пределах одного HTTP-запроса.
+
+    replica — псевдоним реплики для чтения или None, если читать нужно
+    с основной базы; wrote — была ли в запросе запись.
+    """
+
+    def __init__(self):
+        self.replica = None
+        self.wrote = False
+
+
+def pin_to_primary(response, user_pk):
+    """
+    Пользователь читает с основной базы ещё
+    NEWS_REPLICA_PIN_SECONDS секунд после записи.
+
+    Отметка хранится в подписанной cookie, а не в кеше процесса,
+    поэтому её видят все процессы, которые обслуживают пользователя.
+    """
+    response.set_signed_cookie(
+        PRIMARY_PIN_COOKIE,
+        str(user_pk),
+        salt=PRIMARY_PIN_COOKIE,
+        max_age=settings.NEWS_REPLICA_PIN_SECONDS,
+        httponly=True,
+        samesite='Lax',
+    )
+
+
+def is_pinned_to_primary(request):
+    """Подпись cookie проверяется вместе с её возрастом."""
+    user_pk = request.get_signed_cookie(
+        PRIMARY_PIN_COOKIE,
+        default=None,
+        salt=PRIMARY_PIN_COOKIE,
+        max_age=settings.NEWS_REPLICA_PIN_SECONDS,
+    )
+    return user_pk == str(request.user.pk)
+
+
+def use_replica(state):
+    """Разрешает чтение с одной из реплик до конца запроса."""
+    replicas = settings.NEWS_READ_REPLICAS
+    if replicas and not state.wrote:
+        state.replica = random.choice(replicas)
+
+
+class ReplicaRouter:
+    """
+    Чтение с реплик для представлений, которые только читают;
+    запись — в основную базу.
+
+    Реплика выбирается один раз на запрос, поэтому все чтения запроса
+    видят одни и те же данные. После первой записи чтения до конца
+    запроса идут в основную базу, иначе запрос не увидел бы то, что
+    сам только что записал. Вне HTTP-запросов — в командах, фоновых
+    потоках, тестах — всё идёт в основную базу.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = routing_state.get()
+        if state is not None and state.replica is not None:
+            return state.replica
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = routing_state.get()
+        if state is not None:
+            state.replica = None
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """На репликах те же данные, что в основной базе."""
+        databases = {DEFAULT_DB_ALIAS, *settings.NEWS_READ_REPLICAS}
+        return obj1._state.db in databases and obj2._state.db in databases
@@ -0,0 +1,75 @@
+from django.core.signals import request_started
+from django.db.backends.signals import connection_created
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .cache import bump_home_version
+from .connections import check_connections, count
+from .models import BadWord, Comment, News
+from .moderation import bump_bad_words_version
+from .search import (
+    index_comment, index_news, unindex_comment, unindex_news
+)
+from .sqlite import apply_pragmas
+
+
+def touch_news(news_id, comment_delta=0):
+    """
+    Отмечает изменение комментариев новости.
+
+    Время изменения новости служит версией её страницы и главной,
+    поэтому меняется в той же транзакции, что и комментарий. Счётчик
+    комментариев меняется одним UPDATE на стороне базы данных,
+    поэтому одновременные комментарии не теряются. Число комментариев
+    выводится на главной, поэтому при его изменении меняется и её версия.
+    """
+    fields = {'modified': timezone.now()}
+    if comment_delta:
+        fields['comment_count'] = F('comment_count') + comment_delta
+        bump_home_version()
+    News.objects.filter(pk=news_id).update(**fields)
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        touch_news(instance.news_id, 1 if created else 0)
+    index_comment(instance)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    touch_news(instance.news_id, -1)
+    unindex_comment(instance.pk)
+
+
+@receiver(post_save, sender=News)
+def news_saved(sender, instance, **kwargs):
+    bump_home_version()
+    index_news(instance)
+
+
+@receiver(post_delete, sender=News)
+def news_deleted(sender, instance, **kwargs):
+    bump_home_version()
+    unindex_news(instance.pk)
+
+
+@receiver(post_save, sender=BadWord)
+@receiver(post_delete, sender=BadWord)
+def bad_words_changed(sender, **kwargs):
+    bump_bad_words_version()
+
+
+@receiver(connection_created)
+def connection_opened(sender, connection, **kwargs):
+    count('connections_opened')
+    apply_pragmas(connection)
+
+
+@receiver(request_started)
+def request_started_handler(sender, **kwargs):
+    count('requests')
+    check_connections()
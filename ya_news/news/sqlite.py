@@ -0,0 +1,31 @@
+import re
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+PRAGMA_NAME = re.compile(r'[a-z_]+')
+PRAGMA_VALUE = re.compile(r'-?\w+')
+
+
+def apply_pragmas(connection, pragmas=None):
+    """
+    Выполняет PRAGMA из профиля SQLITE_PRAGMAS на новом соединении.
+
+    Большинство настроек SQLite действуют только в пределах соединения,
+    поэтому их нужно повторять при каждом подключении. Имена и значения
+    подставляются в SQL как есть и потому проверяются.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    if pragmas is None:
+        pragmas = settings.SQLITE_PRAGMAS
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            if not (
+                PRAGMA_NAME.fullmatch(name)
+                and PRAGMA_VALUE.fullmatch(str(value))
+            ):
+                raise ImproperlyConfigured(
+                    f'Некорректная настройка SQLite: {name} = {value!r}'
+                )
+            cursor.execute(f'PRAGMA {name} = {value}')
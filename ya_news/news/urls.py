@@ -13,4 +13,7 @@ urlpatterns = [
         name='delete'
     ),
     path('edit_comment/<int:pk>/', views.CommentUpdate.as_view(), name='edit'),
+    path('search/', views.NewsSearch.as_view(), name='search'),
+    path('cache_stats/', views.cache_stats, name='cache_stats'),
+    path('db_stats/', views.db_stats, name='db_stats'),
 ]
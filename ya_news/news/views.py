@@ -1,49 +1,252 @@
+import hashlib
+from functools import partial
+
 from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.shortcuts import get_object_or_404
+from django.http import Http404, HttpResponse
 from django.urls import reverse
+from django.utils.cache import patch_vary_headers
+from django.utils.decorators import method_decorator
 from django.views import generic
+from django.views.decorators.http import condition
 
+from .cache import cached_page, get_home_version, get_page_cache_stats
+from .connections import connection_stats
 from .forms import CommentForm
 from .models import Comment, News
+from .pagination import CommentPage, page_cursor_for
+from .search import search_news
+
+
+def home_stats(request):
+    """
+    Версия главной страницы и время её изменения, один запрос на запрос.
+
+    Значения берутся из базы, поэтому одинаковы во всех процессах
+    и после записи из management-команд.
+    """
+    if not hasattr(request, '_home_stats'):
+        request._home_stats = get_home_version()
+    return request._home_stats
+
+
+def home_version(request):
+    """Версия главной страницы для кеша и ETag."""
+    return str(home_stats(request)[0])
+
+
+def home_etag(request, *args, **kwargs):
+    """
+    Значение ETag главной страницы.
+
+    Страница отличается для разных пользователей,
+    поэтому в ETag входит id пользователя.
+    """
+    return f'{home_version(request)}-{request.user.pk or 0}'
+
+
+def home_last_modified(request, *args, **kwargs):
+    """
+    Время изменения отдаётся только анонимным пользователям:
+    для остальных страница зависит ещё и от того, кто вошёл.
+    """
+    if not request.user.is_authenticated:
+        return home_stats(request)[1]
+
+
+def get_news(request, pk):
+    """
+    Новость загружается один раз на запрос.
+
+    Её время изменения нужно для ETag и Last-Modified,
+    а сама новость — для страницы.
+    """
+    if not hasattr(request, '_news'):
+        request._news = News.objects.filter(pk=pk).first()
+    return request._news
+
+
+def news_etag(request, pk, *args, **kwargs):
+    """
+    Значение ETag страницы новости.
+
+    Авторизованный пользователь видит на странице форму с CSRF-токеном.
+    Токен меняется вместе с CSRF-cookie, например при повторном входе,
+    поэтому в ETag входит хеш cookie: иначе ответ 304 оставил бы
+    в браузере старый токен и отправка формы завершилась бы ошибкой 403.
+    """
+    news = get_news(request, pk)
+    if not news:
+        return None
+    etag = f'{news.modified.timestamp()}-{request.user.pk or 0}'
+    if request.user.is_authenticated:
+        csrf_cookie = request.COOKIES.get(settings.CSRF_COOKIE_NAME, '')
+        etag += '-' + hashlib.sha256(csrf_cookie.encode()).hexdigest()[:16]
+    return etag
+
+
+def news_last_modified(request, pk, *args, **kwargs):
+    news = get_news(request, pk)
+    if news and not request.user.is_authenticated:
+        return news.modified
+
+
+def home_news():
+    """
+    Выводим только несколько последних новостей.
+
+    Их количество определяется в настройках проекта.
+    Комментарии не загружаются: их количество хранится
+    в самой новости.
+    """
+    return News.objects.all()[:settings.NEWS_COUNT_ON_HOME_PAGE]
+
+
+def home_page(request, render):
+    """
+    Ответ главной страницы, render формирует её заново.
+
+    Анонимным пользователям страница отдаётся из кеша целиком.
+    """
+    if request.user.is_authenticated:
+        response = render()
+    else:
+        response = cached_page(
+            'home',
+            home_version(request),
+            render,
+            timeout=settings.NEWS_HOME_CACHE_TIMEOUT,
+            lock_timeout=settings.NEWS_HOME_CACHE_LOCK_TIMEOUT,
+        )
+    patch_vary_headers(response, ('Cookie',))
+    return response
+
+
+def comment_page(request, news):
+    return CommentPage(
+        news,
+        after=request.GET.get('after'),
+        before=request.GET.get('before'),
+    )
+
+
+def detail_context(request, news):
+    """
+    Контекст страницы новости, кроме самой новости.
 
+    Анонимным пользователям страница отдаётся из кеша фрагментов.
+    Ключ фрагмента включает время изменения новости из базы,
+    поэтому изменение новости или её комментариев сразу даёт
+    новый ключ во всех процессах.
+    """
+    context = {'comments': comment_page(request, news)}
+    if request.user.is_authenticated:
+        context['form'] = CommentForm()
+    else:
+        context['news_version'] = news.modified.timestamp()
+        context['cache_timeout'] = settings.NEWS_DETAIL_CACHE_TIMEOUT
+    return context
 
+
+@method_decorator(
+    condition(etag_func=home_etag, last_modified_func=home_last_modified),
+    name='get'
+)
 class NewsList(generic.ListView):
     """Список новостей."""
     model = News
+    replica_reads = True
     template_name = 'news/home.html'
 
+    def get_queryset(self):
+        return home_news()
+
+    def get(self, request, *args, **kwargs):
+        return home_page(
+            request, partial(self.render_page, request, *args, **kwargs)
+        )
+
+    def render_page(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs).render()
+
+
+class NewsSearch(generic.ListView):
+    """Поиск по новостям и комментариям."""
+    template_name = 'news/search.html'
+
     def get_queryset(self):
         """
-        Выводим только несколько последних новостей.
+        Одна страница результатов полнотекстового поиска.
 
-        Их количество определяется в настройках проекта.
+        Выбираем на одну новость больше размера страницы, чтобы узнать,
+        есть ли следующая, не считая все совпадения.
         """
-        return self.model.objects.prefetch_related(
-            'comment_set'
-        )[:settings.NEWS_COUNT_ON_HOME_PAGE]
+        self.query = self.request.GET.get('q', '').strip()
+        self.page_number = self.get_page_number()
+        per_page = settings.NEWS_COUNT_ON_SEARCH_PAGE
+        return search_news(
+            self.query,
+            offset=(self.page_number - 1) * per_page,
+            limit=per_page + 1
+        )
 
+    def get_page_number(self):
+        """
+        Номер страницы из ?page=, не больше NEWS_SEARCH_MAX_PAGE.
 
+        Слишком длинная строка цифр не переводится в int:
+        она заведомо больше предела.
+        """
+        page = self.request.GET.get('page', '')
+        max_page = settings.NEWS_SEARCH_MAX_PAGE
+        if not page.isdecimal():
+            return 1
+        if len(page) > len(str(max_page)):
+            return max_page
+        return min(max(int(page), 1), max_page)
+
+    def get_context_data(self, **kwargs):
+        per_page = settings.NEWS_COUNT_ON_SEARCH_PAGE
+        page = self.object_list[:per_page]
+        context = super().get_context_data(object_list=page, **kwargs)
+        context['query'] = self.query
+        context['page_number'] = self.page_number
+        context['has_next'] = len(self.object_list) > per_page
+        return context
+
+
+class CommentPageMixin:
+    """Добавляет в контекст страницу комментариев к новости."""
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['comments'] = comment_page(self.request, self.object)
+        return context
+
+
+@method_decorator(
+    condition(etag_func=news_etag, last_modified_func=news_last_modified),
+    name='get'
+)
 class NewsDetail(generic.DetailView):
     model = News
     template_name = 'news/detail.html'
 
     def get_object(self, queryset=None):
-        obj = get_object_or_404(
-            self.model.objects.prefetch_related('comment_set__author'),
-            pk=self.kwargs['pk']
-        )
+        obj = get_news(self.request, self.kwargs['pk'])
+        if obj is None:
+            raise Http404('Новость не найдена.')
         return obj
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        if self.request.user.is_authenticated:
-            context['form'] = CommentForm()
+        context.update(detail_context(self.request, self.object))
         return context
 
 
 class NewsComment(
         LoginRequiredMixin,
+        CommentPageMixin,
         generic.detail.SingleObjectMixin,
         generic.FormView
 ):
@@ -60,22 +263,34 @@ class NewsComment(
         comment.news = self.object
         comment.author = self.request.user
         comment.save()
+        self.comment = comment
         return super().form_valid(form)
 
     def get_success_url(self):
-        post = self.get_object()
-        return reverse('news:detail', kwargs={'pk': post.pk}) + '#comments'
+        """Возвращает на страницу комментариев с новым комментарием."""
+        url = reverse('news:detail', kwargs={'pk': self.object.pk})
+        cursor = page_cursor_for(self.comment)
+        if cursor:
+            url += f'?after={cursor}'
+        return url + '#comments'
 
 
 class NewsDetailView(generic.View):
+    """
+    Страница новости: GET показывает новость, POST добавляет комментарий.
+
+    Функции представлений создаются один раз при загрузке модуля.
+    GET только читает, поэтому может читать с реплики.
+    """
+    replica_reads = True
+    detail_view = staticmethod(NewsDetail.as_view())
+    comment_view = staticmethod(NewsComment.as_view())
 
     def get(self, request, *args, **kwargs):
-        view = NewsDetail.as_view()
-        return view(request, *args, **kwargs)
+        return self.detail_view(request, *args, **kwargs)
 
     def post(self, request, *args, **kwargs):
-        view = NewsComment.as_view()
-        return view(request, *args, **kwargs)
+        return self.comment_view(request, *args, **kwargs)
 
 
 class CommentBase(LoginRequiredMixin):
@@ -83,9 +298,9 @@ class CommentBase(LoginRequiredMixin):
     model = Comment
 
     def get_success_url(self):
-        comment = self.get_object()
+        """Комментарий уже загружен, id новости берётся из него."""
         return reverse(
-            'news:detail', kwargs={'pk': comment.news.pk}
+            'news:detail', kwargs={'pk': self.object.news_id}
         ) + '#comments'
 
     def get_queryset(self):
@@ -102,3 +317,27 @@ class CommentUpdate(CommentBase, generic.UpdateView):
 class CommentDelete(CommentBase, generic.DeleteView):
     """Удаление комментария."""
     template_name = 'news/delete.html'
+
+
+def cache_stats(request):
+    """Счётчики кеша страниц в текстовом формате Prometheus."""
+    lines = [
+        f'news_page_cache_requests_total{{page="{page}",result="{result}"}}'
+        f' {value}'
+        for (page, result), value in get_page_cache_stats().items()
+    ]
+    return HttpResponse(
+        '\n'.join(lines) + '\n', content_type='text/plain; version=0.0.4'
+    )
+
+
+def db_stats(request):
+    """Счётчики соединений с базой данных в текстовом формате Prometheus."""
+    stats = connection_stats()
+    return HttpResponse(
+        f'db_requests_total {stats["requests"]}\n'
+        f'db_connections_opened_total {stats["connections_opened"]}\n'
+        'db_connection_health_check_failures_total '
+        f'{stats["health_check_failures"]}\n',
+        content_type='text/plain; version=0.0.4'
+    )
@@ -3,14 +3,57 @@ ASGI config for yanews project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Database connections: Django 3.2 runs every synchronous view of every
+request in one shared thread, so the process holds a single connection
+per database. It is reused for up to ``CONN_MAX_AGE`` seconds and
+health-checked before each request, the same as under WSGI. The same
+thread also serialises the views.
+
+Async views: with ``NEWS_ASYNC_VIEWS`` set, requests are resolved
+against ``yanews.asgi_urls``, where the home and news detail pages are
+served by the async views from ``news.async_views``; every other URL is
+the same as under WSGI. Those views run their queries in a pool of
+``NEWS_ASYNC_DB_THREADS`` threads, each holding its own connection. The
+setting is off by default: in ``benchmarks/asgi_wsgi.py`` the async
+views are no faster than the sync views under ASGI, and slower on the
+anonymous home page.
+
+Templates: with ``PRECOMPILE_TEMPLATES`` set (the production settings
+profile) every template is loaded and parsed when the application is
+created, so a syntax error stops the worker from starting and the
+cached loader is warm before the first request.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
 """
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler, ASGIRequest
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yanews.settings')
 
-application = get_asgi_application()
+
+class NewsASGIRequest(ASGIRequest):
+    urlconf = 'yanews.asgi_urls'
+
+
+class NewsASGIHandler(ASGIHandler):
+    request_class = NewsASGIRequest
+
+
+# The same as get_asgi_application(), with the handler above when the
+# async views are enabled.
+django.setup(set_prefix=False)
+if settings.NEWS_ASYNC_VIEWS:
+    application = NewsASGIHandler()
+else:
+    application = ASGIHandler()
+
+if settings.PRECOMPILE_TEMPLATES:
+    # Imported only after Django is set up by the call above.
+    from news.template_warmup import precompile_templates
+
+    precompile_templates()
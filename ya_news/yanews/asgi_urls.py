@@ -0,0 +1,15 @@
+"""
+URL проекта под ASGI с NEWS_ASYNC_VIEWS.
+
+Приложение news подключено из news.async_urls.
+"""
+from django.urls import include, path
+
+from yanews.urls import urlpatterns as wsgi_urlpatterns
+
+urlpatterns = [
+    path('', include('news.async_urls')),
+] + [
+    pattern for pattern in wsgi_urlpatterns
+    if getattr(pattern, 'namespace', None) != 'news'
+]
@@ -26,6 +26,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'news.middleware.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -48,6 +49,10 @@ TEMPLATES = [
     },
 ]
 
+# Разбирать ли все шаблоны при запуске WSGI- и ASGI-приложения
+# (см. settings_production.py).
+PRECOMPILE_TEMPLATES = False
+
 WSGI_APPLICATION = 'yanews.wsgi.application'
 
 
@@ -55,9 +60,54 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Соединение живёт до CONN_MAX_AGE секунд и переиспользуется
+        # следующими запросами того же потока; перед каждым запросом
+        # оно проверяется (CONN_HEALTH_CHECKS). См. wsgi.py и asgi.py.
+        'CONN_MAX_AGE': 60,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Реплики для чтения перечисляются в DATABASES рядом с default,
+# а их псевдонимы — в NEWS_READ_REPLICAS. Пока список пуст,
+# всё читается из основной базы.
+DATABASE_ROUTERS = ['news.routers.ReplicaRouter']
+NEWS_READ_REPLICAS = []
+# Сколько секунд после записи пользователь читает из основной базы:
+# за это время реплика должна догнать основную базу.
+NEWS_REPLICA_PIN_SECONDS = 10
+
+# Под ASGI главную и страницу новости обслуживают асинхронные
+# представления из news/async_views.py (см. yanews/asgi.py).
+# Выключено: по замерам benchmarks/asgi_wsgi.py они не быстрее
+# синхронных представлений под ASGI, а анонимную главную отдают
+# медленнее.
+NEWS_ASYNC_VIEWS = False
+# Сколько потоков выполняют запросы к базе асинхронных представлений
+# (см. news/aio.py). 0 — выполнять их в общем потоке синхронного кода.
+NEWS_ASYNC_DB_THREADS = 8
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# PRAGMA, которые выполняются на каждом новом соединении с SQLite.
+# WAL позволяет читать во время записи. synchronous=NORMAL в режиме WAL
+# сохраняет целостность базы при сбое питания, но последние транзакции
+# могут потеряться. busy_timeout — сколько миллисекунд ждать блокировку
+# записи, прежде чем вернуть «database is locked».
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 256 * 1024 * 1024,
+    # Отрицательное значение — размер в килобайтах.
+    'cache_size': -64 * 1024,
+    'temp_store': 'MEMORY',
+}
+
 
 AUTH_PASSWORD_VALIDATORS = []
 
@@ -80,3 +130,16 @@ LOGIN_URL = reverse_lazy('users:login')
 LOGIN_REDIRECT_URL = reverse_lazy('news:home')
 
 NEWS_COUNT_ON_HOME_PAGE = 10
+NEWS_COUNT_ON_SEARCH_PAGE = 10
+# Дальние страницы поиска отдаются как последняя допустимая,
+# чтобы OFFSET не выходил за пределы целых чисел SQLite.
+NEWS_SEARCH_MAX_PAGE = 1000
+COMMENTS_COUNT_ON_NEWS_PAGE = 50
+NEWS_DETAIL_CACHE_TIMEOUT = 60 * 15
+NEWS_HOME_CACHE_TIMEOUT = 60
+NEWS_HOME_CACHE_LOCK_TIMEOUT = 10
+
+# Как часто процесс сверяет свою версию списка запрещённых слов
+# с версией в базе данных.
+BAD_WORDS_CHECK_INTERVAL = 5
+BAD_WORDS_RELOAD_IN_BACKGROUND = True
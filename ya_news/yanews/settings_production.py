@@ -0,0 +1,32 @@
+"""
+Настройки боевого окружения: DJANGO_SETTINGS_MODULE=yanews.settings_production.
+
+Шаблоны загружаются через кеширующий загрузчик: каждый шаблон читается
+с диска и разбирается один раз на процесс, а не на каждый запрос.
+При запуске процесса все шаблоны разбираются заранее, и синтаксическая
+ошибка в любом из них не даёт серверу стартовать; то же самое без
+запуска сервера проверяет python manage.py precompile_templates.
+"""
+from .settings import *  # noqa: F401, F403
+from .settings import TEMPLATES
+
+DEBUG = False
+
+# Те же источники шаблонов, что дают DIRS и APP_DIRS, но через кеш.
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        'APP_DIRS': False,
+        'OPTIONS': {
+            **TEMPLATES[0]['OPTIONS'],
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
+        },
+    },
+]
+
+PRECOMPILE_TEMPLATES = True
@@ -3,14 +3,33 @@ WSGI config for yanews project.
 
 It exposes the WSGI callable as a module-level variable named ``application``.
 
+Database connections: each worker thread keeps its own connection for
+up to ``CONN_MAX_AGE`` seconds and reuses it for the following requests
+it serves. Before every request the connection is health-checked when
+the database has ``CONN_HEALTH_CHECKS`` set (see ``news/connections.py``),
+so a broken connection is replaced instead of failing the request.
+Connections opened per request are exported at ``db_stats/``.
+
+Templates: with ``PRECOMPILE_TEMPLATES`` set (the production settings
+profile) every template is loaded and parsed when the application is
+created, so a syntax error stops the worker from starting and the
+cached loader is warm before the first request.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/3.2/howto/deployment/wsgi/
 """
 
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yanews.settings')
 
 application = get_wsgi_application()
+
+if settings.PRECOMPILE_TEMPLATES:
+    # Imported only after Django is set up by the call above.
+    from news.template_warmup import precompile_templates
+
+    precompile_templates()
@@ -0,0 +1,12 @@
+"""
+Нагрузочные замеры проекта YaNote.
+
+Запускаются из директории ya_note, например:
+python -m benchmarks.slugify
+"""
+import os
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yanote.settings')
+django.setup()
@@ -0,0 +1,121 @@
+"""
+Задержка полнотекстового поиска по заметкам.
+
+Заполняет тестовую базу заметками нескольких авторов и сравнивает
+поиск через FTS5 с поиском по подстроке (LIKE) в заголовке и тексте.
+LIKE не ранжирует результаты и останавливается на первой странице,
+поэтому быстр для частых слов, но просматривает все заметки автора
+для редких. FTS5, наоборот, ранжирует все совпадения в части индекса
+автора, и для частых слов время растёт с размером этой части.
+Выводит медиану и 99-й перцентиль времени ответа.
+"""
+import argparse
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+
+from benchmarks.utils import test_database
+from notes.models import Note
+from notes.search import search_notes
+
+User = get_user_model()
+BATCH_SIZE = 5000
+SYLLABLES = (
+    'ба', 'ве', 'го', 'ду', 'жи', 'за', 'ки', 'ло', 'ма', 'не', 'по', 'ру',
+    'са', 'ти', 'фе', 'хо', 'це', 'чу', 'ша', 'ще', 'ля', 'ню', 'ре', 'мо',
+)
+
+
+def make_vocabulary(size, rng):
+    """Слова из 2–4 слогов; частота слова падает с его номером (Ципф)."""
+    words = set()
+    while len(words) < size:
+        words.add(''.join(rng.choices(SYLLABLES, k=rng.randint(2, 4))))
+    words = sorted(words)
+    rng.shuffle(words)
+    weights = [1 / rank for rank in range(1, size + 1)]
+    return words, weights
+
+
+def make_text(rng, vocabulary, words):
+    return ' '.join(rng.choices(*vocabulary, k=words))
+
+
+def create_notes(authors, notes, vocabulary, rng):
+    for start in range(0, notes, BATCH_SIZE):
+        Note.objects.bulk_create(
+            Note(
+                title=make_text(rng, vocabulary, rng.randint(2, 5)),
+                text=make_text(rng, vocabulary, rng.randint(20, 80)),
+                slug=f'note-{index}',
+                author=rng.choice(authors),
+            )
+            for index in range(start, min(start + BATCH_SIZE, notes))
+        )
+
+
+def like_search(author, text, offset, limit):
+    """Поиск по подстроке для сравнения: без индекса и без ранжирования."""
+    condition = Q()
+    for term in text.split():
+        condition &= Q(title__icontains=term) | Q(text__icontains=term)
+    return list(
+        Note.objects.filter(condition, author=author).only(
+            'id', 'slug', 'title'
+        ).order_by('id')[offset:offset + limit]
+    )
+
+
+def percentiles(function, queries):
+    timings = []
+    for author, text in queries:
+        started = time.perf_counter()
+        function(author, text, offset=0, limit=20)
+        timings.append((time.perf_counter() - started) * 1000)
+    cuts = statistics.quantiles(timings, n=100)
+    return cuts[49], cuts[98]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--authors', type=int, default=100)
+    parser.add_argument('--notes', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=1000)
+    parser.add_argument('--words', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = make_vocabulary(args.words, rng)
+    with test_database():
+        User.objects.bulk_create(
+            User(username=f'author-{index}')
+            for index in range(args.authors)
+        )
+        authors = list(User.objects.all())
+        started = time.perf_counter()
+        create_notes(authors, args.notes, vocabulary, rng)
+        print(
+            f'Создано заметок: {args.notes} '
+            f'за {time.perf_counter() - started:.1f} с'
+        )
+        queries = [
+            (
+                rng.choice(authors),
+                make_text(rng, vocabulary, rng.randint(1, 2))
+            )
+            for _ in range(args.queries)
+        ]
+        for name, function in (
+            ('FTS5', search_notes),
+            ('LIKE', like_search),
+        ):
+            p50, p99 = percentiles(function, queries)
+            print(f'{name:>5}: p50 {p50:7.2f} мс, p99 {p99:7.2f} мс')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Скорость транслитерации заголовков заметок.
+
+Сравнивает pytils.translit.slugify с кешированной обёрткой на корпусе
+русских заголовков, где популярные заголовки повторяются часто,
+а редкие — один-два раза (распределение Ципфа).
+"""
+import argparse
+import random
+import time
+
+from pytils.translit import slugify
+
+from notes.slugs import cached_slugify, slugify_cache_stats
+
+POPULAR_TITLES = (
+    'Покупки', 'Список дел', 'Идеи', 'Планы на неделю', 'Заметка',
+    'Рецепт борща', 'Книги', 'Фильмы на выходные', 'Подарки',
+    'Дни рождения', 'Отпуск', 'Работа', 'Встреча', 'Учёба', 'Спорт',
+)
+WORDS = (
+    'встреча', 'с', 'командой', 'по', 'проекту', 'купить', 'молоко',
+    'хлеб', 'позвонить', 'маме', 'отчёт', 'за', 'квартал', 'записаться',
+    'к', 'врачу', 'оплатить', 'интернет', 'идеи', 'для', 'статьи',
+    'прочитать', 'главу', 'книги', 'забрать', 'посылку', 'на', 'почте',
+    'подготовить', 'презентацию', 'починить', 'велосипед', 'поездка',
+    'в', 'Петербург', 'список', 'гостей', 'новогодний', 'ужин',
+)
+
+
+def make_corpus(size, rng):
+    """Корпус заголовков: популярные и случайно составленные."""
+    titles = list(POPULAR_TITLES) + [
+        ' '.join(rng.choice(WORDS) for _ in range(rng.randint(2, 6)))
+        for _ in range(size // 10)
+    ]
+    weights = [1 / rank for rank in range(1, len(titles) + 1)]
+    return rng.choices(titles, weights=weights, k=size)
+
+
+def measure(function, corpus):
+    started = time.perf_counter()
+    for title in corpus:
+        function(title)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--titles', type=int, default=200000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.titles, random.Random(args.seed))
+    cached_slugify.cache_clear()
+    for name, function in (
+        ('pytils slugify', slugify),
+        ('с кешем', cached_slugify),
+    ):
+        seconds = measure(function, corpus)
+        print(
+            f'{name:>15}: {seconds:6.2f} с, '
+            f'{len(corpus) / seconds:10.0f} заголовков/с'
+        )
+    stats = slugify_cache_stats()
+    print(
+        f'Попаданий в кеш: {stats["hit_rate"]:.1%} '
+        f'({stats["hits"]} из {stats["hits"] + stats["misses"]}), '
+        f'размер кеша {stats["size"]} из {stats["max_size"]}'
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+Время ответа страниц с кеширующим загрузчиком шаблонов и без него.
+
+Без кеша шаблоны читаются с диска и разбираются на каждый запрос;
+с кешем — как в yanote.settings_production. В yanote.settings
+DEBUG = False, и там Django 3.2 уже неявно включает кеширующий
+загрузчик; профиль делает это явно и не зависит от DEBUG.
+Для каждой страницы выводит среднее время запроса после прогрева и
+время первого запроса после запуска процесса: без разбора шаблонов
+заранее и после precompile_templates. Первый запрос повторяется
+--rounds раз с новым движком шаблонов, выводится медиана.
+"""
+import argparse
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from benchmarks.utils import test_database
+from notes.models import Note
+from notes.template_warmup import precompile_templates
+from yanote.settings_production import TEMPLATES as CACHED_TEMPLATES
+
+SOURCE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+UNCACHED_TEMPLATES = [
+    {
+        **CACHED_TEMPLATES[0],
+        'OPTIONS': {
+            **CACHED_TEMPLATES[0]['OPTIONS'], 'loaders': SOURCE_LOADERS
+        },
+    },
+]
+
+
+def milliseconds_per_request(client, url, templates, requests):
+    with override_settings(TEMPLATES=templates):
+        client.get(url)
+        started = time.perf_counter()
+        for _ in range(requests):
+            client.get(url)
+        return (time.perf_counter() - started) * 1000 / requests
+
+
+def first_request(client, url, precompile, rounds):
+    """Медиана времени первого запроса к странице с новым движком."""
+    timings = []
+    for _ in range(rounds):
+        with override_settings(TEMPLATES=CACHED_TEMPLATES):
+            if precompile:
+                precompile_templates()
+            started = time.perf_counter()
+            client.get(url)
+            timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=300)
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--notes', type=int, default=20)
+    args = parser.parse_args()
+
+    with test_database():
+        author = get_user_model().objects.create(username='Автор')
+        Note.objects.bulk_create(
+            Note(
+                title=f'Заметка {index}',
+                text='Текст заметки',
+                slug=f'note-{index}',
+                author=author,
+            )
+            for index in range(args.notes)
+        )
+        client = Client()
+        client.force_login(author)
+        pages = {
+            'главная': reverse('notes:home'),
+            'список': reverse('notes:list'),
+            'заметка': reverse('notes:detail', args=('note-0',)),
+            'новая': reverse('notes:add'),
+            'поиск': reverse('notes:search') + '?q=заметка',
+        }
+        print(
+            f'{"страница":>10} {"без кеша":>10} {"с кешем":>10} '
+            f'{"первый":>10} {"после precompile":>17}  (мс на запрос)'
+        )
+        for name, url in pages.items():
+            uncached = milliseconds_per_request(
+                client, url, UNCACHED_TEMPLATES, args.requests
+            )
+            cached = milliseconds_per_request(
+                client, url, CACHED_TEMPLATES, args.requests
+            )
+            cold = first_request(client, url, False, args.rounds)
+            precompiled = first_request(client, url, True, args.rounds)
+            print(
+                f'{name:>10} {uncached:10.2f} {cached:10.2f} '
+                f'{cold:10.2f} {precompiled:17.2f}'
+            )
+
+
+if __name__ == '__main__':
+    main()
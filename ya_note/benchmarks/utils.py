@@ -0,0 +1,19 @@
+from contextlib import contextmanager
+
+from django.db import connection
+from django.test.utils import (
+    setup_test_environment, teardown_test_environment
+)
+
+
+@contextmanager
+def test_database():
+    """Временная тестовая база данных с применёнными миграциями."""
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
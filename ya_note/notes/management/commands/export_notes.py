@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from notes.management.commands.import_notes import get_author
+from notes.transfer import EXPORT_CHUNK_SIZE, FORMATS, export_notes
+
+
+class Command(BaseCommand):
+    help = 'Выгружает все заметки пользователя в JSONL или CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('username', help='Автор заметок.')
+        parser.add_argument(
+            '--output',
+            help='Путь к файлу; по умолчанию заметки выводятся на экран.'
+        )
+        parser.add_argument('--format', choices=FORMATS, default='jsonl')
+        parser.add_argument(
+            '--chunk-size', type=int, default=EXPORT_CHUNK_SIZE,
+            help='Сколько заметок читать из базы за раз.'
+        )
+
+    def handle(self, *args, **options):
+        lines = export_notes(
+            get_author(options['username']),
+            options['format'],
+            chunk_size=options['chunk_size']
+        )
+        if not options['output']:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+        try:
+            with open(
+                options['output'], 'w', encoding='utf-8', newline=''
+            ) as file:
+                file.writelines(lines)
+        except OSError as error:
+            raise CommandError(error)
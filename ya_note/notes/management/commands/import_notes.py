@@ -0,0 +1,67 @@
+import io
+import sys
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from notes.transfer import (
+    FORMATS, IMPORT_CHUNK_SIZE, guess_format, import_notes, read_records
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает заметки пользователя из файла JSONL или CSV '
+        'с полями title, text и необязательным slug.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('username', help='Автор заметок.')
+        parser.add_argument(
+            'path', help='Путь к файлу или «-» для стандартного ввода.'
+        )
+        parser.add_argument(
+            '--format', choices=FORMATS,
+            help='Формат файла; по умолчанию определяется по расширению.'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=IMPORT_CHUNK_SIZE,
+            help='Сколько заметок сохранять в одной транзакции.'
+        )
+
+    def handle(self, *args, **options):
+        author = get_author(options['username'])
+        path = options['path']
+        file_format = options['format'] or guess_format(path)
+        if file_format is None:
+            raise CommandError(
+                'Не удалось определить формат файла, укажите --format.'
+            )
+        started = time.perf_counter()
+        try:
+            if path == '-':
+                file = io.TextIOWrapper(
+                    sys.stdin.buffer, encoding='utf-8-sig', newline=''
+                )
+            else:
+                file = open(path, encoding='utf-8-sig', newline='')
+            with file:
+                count = import_notes(
+                    author,
+                    read_records(file, file_format),
+                    chunk_size=options['chunk_size']
+                )
+        except (OSError, ValueError) as error:
+            raise CommandError(error)
+        seconds = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено заметок: {count} за {seconds:.1f} с'
+        ))
+
+
+def get_author(username):
+    try:
+        return get_user_model().objects.get(username=username)
+    except get_user_model().DoesNotExist:
+        raise CommandError(f'Пользователь {username} не найден.')
@@ -0,0 +1,62 @@
+# Generated by Django 3.2.15 on 2026-10-17 06:37
+
+from django.db import migrations
+
+# Полнотекстовый индекс заметок хранит только токены, сами тексты
+# читаются из notes_note (external content). Индекс обновляют триггеры,
+# поэтому он согласован с таблицей при любом способе записи,
+# включая bulk_create и QuerySet.update.
+# Внимание: при изменении полей Note на SQLite Django пересоздаёт
+# таблицу notes_note, и триггеры удаляются вместе со старой таблицей.
+# Такие миграции должны создавать триггеры заново.
+CREATE_FTS = [
+    """
+    CREATE VIRTUAL TABLE notes_note_fts USING fts5(
+        title, text, author_id,
+        content='notes_note', content_rowid='id', prefix='2 3',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER notes_note_fts_insert AFTER INSERT ON notes_note BEGIN
+        INSERT INTO notes_note_fts(rowid, title, text, author_id)
+        VALUES (new.id, new.title, new.text, new.author_id);
+    END
+    """,
+    """
+    CREATE TRIGGER notes_note_fts_delete AFTER DELETE ON notes_note BEGIN
+        INSERT INTO notes_note_fts(
+            notes_note_fts, rowid, title, text, author_id
+        ) VALUES ('delete', old.id, old.title, old.text, old.author_id);
+    END
+    """,
+    """
+    CREATE TRIGGER notes_note_fts_update
+    AFTER UPDATE OF title, text, author_id ON notes_note BEGIN
+        INSERT INTO notes_note_fts(
+            notes_note_fts, rowid, title, text, author_id
+        ) VALUES ('delete', old.id, old.title, old.text, old.author_id);
+        INSERT INTO notes_note_fts(rowid, title, text, author_id)
+        VALUES (new.id, new.title, new.text, new.author_id);
+    END
+    """,
+    # Индексируем заметки, созданные до миграции.
+    "INSERT INTO notes_note_fts(notes_note_fts) VALUES ('rebuild')",
+]
+DROP_FTS = [
+    'DROP TRIGGER notes_note_fts_update',
+    'DROP TRIGGER notes_note_fts_delete',
+    'DROP TRIGGER notes_note_fts_insert',
+    'DROP TABLE notes_note_fts',
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notes', '0003_note_modified'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_FTS, DROP_FTS),
+    ]
@@ -0,0 +1,105 @@
+# Generated by Django 3.2.15 on 2026-10-17 15:20
+
+from importlib import import_module
+
+from django.db import migrations
+
+note_fts = import_module('notes.migrations.0004_note_fts')
+
+# Индекс разбивается на части по остатку от деления author_id, столько
+# же, сколько notes.search.FTS_PARTITIONS. Изменить число частей можно
+# только новой миграцией. Части — те же таблицы FTS5 с внешним
+# содержимым из notes_note; заметка лежит в части своего автора.
+PARTITIONS = 32
+TABLE = 'notes_note_fts_{partition}'
+COLUMNS = 'title, text, author_id'
+
+
+def create_table(partition):
+    table = TABLE.format(partition=partition)
+    return [
+        f"""
+        CREATE VIRTUAL TABLE {table} USING fts5(
+            {COLUMNS},
+            content='notes_note', content_rowid='id', prefix='2 3',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+        """,
+        # 'rebuild' проиндексировал бы в каждой части все заметки.
+        f"""
+        INSERT INTO {table}(rowid, {COLUMNS})
+        SELECT id, {COLUMNS} FROM notes_note
+        WHERE author_id % {PARTITIONS} = {partition}
+        """,
+    ]
+
+
+def insert_into_partitions(row):
+    return ''.join(
+        f"""
+        INSERT INTO {TABLE.format(partition=partition)}(rowid, {COLUMNS})
+        SELECT {row}.id, {row}.title, {row}.text, {row}.author_id
+        WHERE {row}.author_id % {PARTITIONS} = {partition};"""
+        for partition in range(PARTITIONS)
+    )
+
+
+def delete_from_partitions(row):
+    return ''.join(
+        f"""
+        INSERT INTO {TABLE.format(partition=partition)}(
+            {TABLE.format(partition=partition)}, rowid, {COLUMNS}
+        )
+        SELECT 'delete', {row}.id, {row}.title, {row}.text, {row}.author_id
+        WHERE {row}.author_id % {PARTITIONS} = {partition};"""
+        for partition in range(PARTITIONS)
+    )
+
+
+# Триггеры те же, что в 0004_note_fts, но пишут только в часть автора.
+# При смене автора заметка переносится в другую часть.
+CREATE_FTS = [
+    statement
+    for partition in range(PARTITIONS)
+    for statement in create_table(partition)
+] + [
+    f"""
+    CREATE TRIGGER notes_note_fts_insert AFTER INSERT ON notes_note BEGIN
+        {insert_into_partitions('new')}
+    END
+    """,
+    f"""
+    CREATE TRIGGER notes_note_fts_delete AFTER DELETE ON notes_note BEGIN
+        {delete_from_partitions('old')}
+    END
+    """,
+    f"""
+    CREATE TRIGGER notes_note_fts_update
+    AFTER UPDATE OF title, text, author_id ON notes_note BEGIN
+        {delete_from_partitions('old')}
+        {insert_into_partitions('new')}
+    END
+    """,
+]
+DROP_FTS = [
+    'DROP TRIGGER notes_note_fts_update',
+    'DROP TRIGGER notes_note_fts_delete',
+    'DROP TRIGGER notes_note_fts_insert',
+] + [
+    f'DROP TABLE {TABLE.format(partition=partition)}'
+    for partition in range(PARTITIONS)
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notes', '0004_note_fts'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            note_fts.DROP_FTS + CREATE_FTS,
+            DROP_FTS + note_fts.CREATE_FTS,
+        ),
+    ]
@@ -1,7 +1,15 @@
+import random
+import re
+
 from django.conf import settings
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models.functions import Length
+
+from .slugs import cached_slugify
 
-from pytils.translit import slugify
+# Место под суффикс вида -123 для автоматически созданного slug.
+SLUG_SUFFIX_LENGTH = 11
+SLUG_ALLOCATION_ATTEMPTS = 10
 
 
 class Note(models.Model):
@@ -27,12 +35,77 @@ class Note(models.Model):
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
     )
+    modified = models.DateTimeField('Дата изменения', auto_now=True)
+
+    class Meta:
+        indexes = (
+            models.Index(fields=('author', 'id'), name='note_author_id_idx'),
+        )
 
     def __str__(self):
         return self.title
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            max_slug_length = self._meta.get_field('slug').max_length
-            self.slug = slugify(self.title)[:max_slug_length]
-        super().save(*args, **kwargs)
+        if self.slug:
+            return super().save(*args, **kwargs)
+        max_slug_length = self._meta.get_field('slug').max_length
+        base = cached_slugify(
+            self.title
+        )[:max_slug_length - SLUG_SUFFIX_LENGTH]
+        for attempt in range(SLUG_ALLOCATION_ATTEMPTS):
+            # При повторных попытках суффикс выбирается со случайным
+            # сдвигом, чтобы параллельные запросы не взяли его снова.
+            self.slug = self.allocate_slug(
+                base, skip=random.randrange(2 ** attempt)
+            )
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                # Такой же slug мог только что занять параллельный запрос.
+                if not Note.objects.filter(slug=self.slug).exists():
+                    raise
+        self.slug = ''
+        raise IntegrityError(
+            f'Не удалось подобрать свободный slug для «{self.title}».'
+        )
+
+    def allocate_slug(self, base, skip=0):
+        """
+        Подбирает свободный slug одним запросом.
+
+        Если base занят, к нему добавляется суффикс -2, -3 и так далее:
+        берётся следующий за последним занятым вариантом по индексу на slug,
+        пропустив ещё skip номеров.
+        """
+        number = last_slug_number(base, exclude_pk=self.pk)
+        if not number and not skip:
+            return base
+        return f'{base}-{max(number, 1) + 1 + skip}'
+
+
+def last_slug_number(base, exclude_pk=None):
+    """
+    Номер последнего занятого варианта base одним запросом.
+
+    0 — base свободен, 1 — занят только сам base, N — занят base-N.
+    Из базы читается одна строка, сколько бы заметок ни было
+    с таким же заголовком.
+    """
+    pattern = rf'^{re.escape(base)}-[1-9][0-9]*$'
+    taken = Note.objects.filter(
+        # Диапазон по индексу покрывает base и все варианты base-*.
+        slug__gte=base, slug__lt=base + '.'
+    ).filter(models.Q(slug=base) | models.Q(slug__regex=pattern))
+    if exclude_pk:
+        taken = taken.exclude(pk=exclude_pk)
+    last_slug = taken.annotate(
+        slug_length=Length('slug')
+    ).order_by('-slug_length', '-slug').values_list(
+        'slug', flat=True
+    ).first()
+    if last_slug is None:
+        return 0
+    if last_slug == base:
+        return 1
+    return int(last_slug.rsplit('-', 1)[1])
@@ -0,0 +1,75 @@
+import re
+
+from .models import Note
+
+# Полнотекстовый индекс разбит на FTS_PARTITIONS таблиц по остатку
+# от деления author_id (см. миграцию 0005_note_fts_partitions). bm25
+# перед ранжированием считает, в скольких заметках таблицы встречается
+# каждое слово запроса, и для частых слов в общей таблице это чтение
+# почти всего индекса. В части индекса заметок в FTS_PARTITIONS раз
+# меньше, и ранжируются только совпадения из неё.
+FTS_PARTITIONS = 32
+FTS_TABLE = 'notes_note_fts_{partition}'
+TERM = re.compile(r'\w+')
+# Совпадение в заголовке весит больше, чем в тексте; по author_id
+# только фильтруем. Совпадения ранжируются по одному индексу,
+# а из notes_note читаются только заметки выбранной страницы.
+SEARCH_SQL = '''
+    SELECT notes_note.id, notes_note.title, notes_note.slug
+    FROM (
+        SELECT rowid, bm25({table}, 10.0, 1.0, 0.0) AS score
+        FROM {table}
+        WHERE {table} MATCH %s
+        ORDER BY score, rowid
+        LIMIT %s OFFSET %s
+    ) AS hits
+    JOIN notes_note ON notes_note.id = hits.rowid
+    ORDER BY hits.score, hits.rowid
+'''
+
+
+def fts_tables():
+    """Все части полнотекстового индекса."""
+    return [
+        FTS_TABLE.format(partition=partition)
+        for partition in range(FTS_PARTITIONS)
+    ]
+
+
+def fts_table(author_id):
+    """Часть индекса, в которой лежат заметки автора."""
+    return FTS_TABLE.format(partition=int(author_id) % FTS_PARTITIONS)
+
+
+def build_match_query(text, author_id):
+    """
+    Выражение FTS5 MATCH для поискового запроса пользователя.
+
+    Слова ищутся в заголовке и тексте целиком, последнее — по началу,
+    чтобы находить недописанное слово и другие его формы. Префиксы
+    покрыты отдельным индексом FTS5. Служебный синтаксис FTS5
+    в запросе не работает. Условие на автора входит
+    в тот же MATCH, поэтому заметки других пользователей из той же
+    части индекса отсекаются в индексе. Если в запросе нет слов,
+    возвращает None.
+    """
+    terms = TERM.findall(text.lower())
+    if not terms:
+        return None
+    words = ' '.join(f'"{term}"' for term in terms) + '*'
+    return f'author_id : {int(author_id)} AND {{title text}} : ({words})'
+
+
+def search_notes(author, text, offset, limit):
+    """
+    Заметки автора, подходящие под запрос, от наиболее релевантных.
+
+    Из заметок загружаются только id, title и slug.
+    """
+    match = build_match_query(text, author.pk)
+    if match is None:
+        return []
+    return list(Note.objects.raw(
+        SEARCH_SQL.format(table=fts_table(author.pk)),
+        [match, limit, offset]
+    ))
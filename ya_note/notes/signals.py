@@ -0,0 +1,44 @@
+from django.core.signals import request_started
+from django.db import DatabaseError
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from .connections import check_connections, count
+from .search import fts_tables
+from .sqlite import apply_pragmas
+
+
+@receiver(connection_created)
+def connection_opened(sender, connection, **kwargs):
+    count('connections_opened')
+    apply_pragmas(connection)
+
+
+@receiver(request_started)
+def request_started_handler(sender, **kwargs):
+    count('requests')
+    check_connections()
+
+
+@receiver(connection_created)
+def connect_search_index(sender, connection, **kwargs):
+    """
+    Подключает все части полнотекстового индекса сразу после открытия
+    соединения, одним запросом.
+
+    При первом обращении FTS5 читает свои настройки из базы. Если это
+    происходит внутри транзакции, которая затем пишет в notes_note,
+    в режиме WAL SQLite может отказать ей с ошибкой «database is locked»,
+    не дожидаясь освобождения блокировки.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(' UNION ALL '.join(
+                f'SELECT * FROM (SELECT rowid FROM {table} LIMIT 0)'
+                for table in fts_tables()
+            ))
+    except DatabaseError:
+        # Миграции с индексом ещё не применены.
+        pass
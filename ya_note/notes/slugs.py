@@ -0,0 +1,28 @@
+from functools import lru_cache
+
+from django.conf import settings
+from pytils.translit import slugify
+
+
+@lru_cache(maxsize=settings.NOTES_SLUGIFY_CACHE_SIZE)
+def cached_slugify(title):
+    """
+    Транслитерация заголовка в slug с кешем в памяти процесса.
+
+    Заголовки заметок часто повторяются, а транслитерация pytils
+    заметно дороже поиска в словаре.
+    """
+    return slugify(title)
+
+
+def slugify_cache_stats():
+    """Статистика кеша транслитерации."""
+    info = cached_slugify.cache_info()
+    requests = info.hits + info.misses
+    return {
+        'hits': info.hits,
+        'misses': info.misses,
+        'size': info.currsize,
+        'max_size': info.maxsize,
+        'hit_rate': info.hits / requests if requests else 0.0,
+    }
@@ -0,0 +1,46 @@
+import os
+
+from django.template import TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates
+
+
+def template_names(engine):
+    """Имена всех шаблонов в каталогах, которые просматривают загрузчики."""
+    names = set()
+    for loader in engine.template_loaders:
+        # Кеширующий загрузчик хранит список загрузчиков, которые он кеширует.
+        for source in getattr(loader, 'loaders', (loader,)):
+            if not hasattr(source, 'get_dirs'):
+                continue
+            for directory in source.get_dirs():
+                for root, _, files in os.walk(directory):
+                    names.update(
+                        os.path.relpath(
+                            os.path.join(root, file), directory
+                        ).replace(os.sep, '/')
+                        for file in files if not file.startswith('.')
+                    )
+    return sorted(names)
+
+
+def precompile_templates():
+    """
+    Загружает и разбирает все шаблоны проекта.
+
+    С кеширующим загрузчиком разобранные шаблоны остаются в памяти
+    процесса, и первые запросы не тратят время на чтение и разбор.
+    Синтаксическая ошибка в любом шаблоне выбрасывает
+    TemplateSyntaxError сразу, а не на первом запросе к странице.
+    Возвращает число разобранных шаблонов.
+    """
+    count = 0
+    for backend in engines.all():
+        if not isinstance(backend, DjangoTemplates):
+            continue
+        for name in template_names(backend.engine):
+            try:
+                backend.engine.get_template(name)
+            except TemplateSyntaxError as error:
+                raise TemplateSyntaxError(f'{name}: {error}') from error
+            count += 1
+    return count
@@ -0,0 +1,129 @@
+import io
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from asgiref.testing import ApplicationCommunicator
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.test import Client, TransactionTestCase
+from django.urls import reverse
+
+from notes.connections import connection_stats
+from yanote.asgi import application as asgi_application
+from yanote.wsgi import application as wsgi_application
+
+User = get_user_model()
+
+
+class TestConnectionReuse(TransactionTestCase):
+    """
+    Класс тестирования переиспользования соединений с базой.
+
+    Запросы проходят через настоящие точки входа wsgi.py и asgi.py,
+    которые, в отличие от тестового клиента, закрывают устаревшие
+    соединения в начале и в конце запроса.
+    """
+    REQUESTS = 3
+
+    def setUp(self):
+        user = User.objects.create(username='Автор')
+        client = Client()
+        client.force_login(user)
+        self.cookie = f'sessionid={client.cookies["sessionid"].value}'
+        self.url = reverse('notes:list')
+        max_age = connection.settings_dict['CONN_MAX_AGE']
+        self.addCleanup(
+            connection.settings_dict.__setitem__, 'CONN_MAX_AGE', max_age
+        )
+
+    def wsgi_get(self):
+        environ = {
+            'REQUEST_METHOD': 'GET',
+            'PATH_INFO': self.url,
+            'SERVER_NAME': 'testserver',
+            'SERVER_PORT': '80',
+            'HTTP_COOKIE': self.cookie,
+            'wsgi.input': io.BytesIO(),
+            'wsgi.url_scheme': 'http',
+        }
+        statuses = []
+        response = wsgi_application(
+            environ, lambda status, headers: statuses.append(status)
+        )
+        b''.join(response)
+        response.close()
+        return int(statuses[0].split()[0])
+
+    @async_to_sync
+    async def asgi_get(self):
+        communicator = ApplicationCommunicator(asgi_application, {
+            'type': 'http',
+            'method': 'GET',
+            'path': self.url,
+            'query_string': b'',
+            'headers': [(b'cookie', self.cookie.encode())],
+        })
+        await communicator.send_input({'type': 'http.request'})
+        start = await communicator.receive_output()
+        await communicator.receive_output()
+        return start['status']
+
+    def connections_opened(self, get, max_age):
+        """Сколько соединений открыли REQUESTS запросов подряд."""
+        connection.settings_dict['CONN_MAX_AGE'] = max_age
+        connection.close()
+        opened = connection_stats()['connections_opened']
+        for _ in range(self.REQUESTS):
+            self.assertEqual(get(), 200)
+        return connection_stats()['connections_opened'] - opened
+
+    def test_connection_reuse(self):
+        """
+        С CONN_MAX_AGE = 0 каждый запрос открывает своё соединение,
+        с положительным CONN_MAX_AGE одно соединение обслуживает
+        все запросы — и через WSGI, и через ASGI.
+        """
+        for name, get in (
+            ('wsgi', self.wsgi_get), ('asgi', self.asgi_get)
+        ):
+            for max_age, expected in ((0, self.REQUESTS), (60, 1)):
+                with self.subTest(entry_point=name, max_age=max_age):
+                    self.assertEqual(
+                        self.connections_opened(get, max_age), expected
+                    )
+
+    def test_broken_connection_is_replaced(self):
+        """
+        Неисправное соединение, оставшееся с прошлого запроса,
+        закрывается перед следующим запросом, и тот открывает новое.
+        """
+        for name, get in (
+            ('wsgi', self.wsgi_get), ('asgi', self.asgi_get)
+        ):
+            with self.subTest(entry_point=name):
+                self.connections_opened(get, 60)
+                before = connection_stats()
+                with mock.patch.object(
+                    type(connections[DEFAULT_DB_ALIAS]), 'is_usable',
+                    return_value=False
+                ):
+                    self.assertEqual(get(), 200)
+                after = connection_stats()
+                self.assertEqual(
+                    after['health_check_failures'],
+                    before['health_check_failures'] + 1
+                )
+                self.assertEqual(
+                    after['connections_opened'],
+                    before['connections_opened'] + 1
+                )
+
+    def test_db_stats(self):
+        """Счётчики соединений отдаются в формате Prometheus."""
+        self.wsgi_get()
+        response = self.client.get(reverse('notes:db_stats'))
+        stats = connection_stats()
+        self.assertIn(
+            f'db_connections_opened_total {stats["connections_opened"]}',
+            response.content.decode()
+        )
@@ -1,9 +1,15 @@
+import re
+from http import HTTPStatus
+
 from django.contrib.auth import get_user_model
-from django.test import Client, TestCase
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from notes.forms import NoteForm
 from notes.models import Note
+from notes.search import FTS_PARTITIONS, fts_table
 
 
 User = get_user_model()
@@ -55,3 +61,190 @@ class TestAddNote(TestCase):
                 self.assertEqual(
                     (self.author_note in object_list), note_in_list
                 )
+
+
+class TestNotesListPagination(TestCase):
+    NOTES_COUNT = 7
+    PAGE_SIZE = 3
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Автор')
+        cls.author_client = Client()
+        cls.author_client.force_login(cls.author)
+        Note.objects.bulk_create(
+            Note(
+                title=f'Заметка {index}',
+                text='Текст',
+                slug=f'note-{index}',
+                author=cls.author
+            )
+            for index in range(cls.NOTES_COUNT)
+        )
+
+    @override_settings(NOTES_COUNT_ON_LIST_PAGE=PAGE_SIZE)
+    def test_notes_list_is_paginated_by_cursor(self):
+        """
+        Список заметок выводится страницами ограниченного размера.
+        Страницы выбираются по курсору id без OFFSET и без текста заметок
+        и вместе содержат все заметки пользователя по порядку.
+        """
+        url = reverse('notes:list')
+        shown_notes = []
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.author_client.get(url)
+            page = response.context['object_list']
+            self.assertLessEqual(len(page), self.PAGE_SIZE)
+            notes_sql = [
+                query['sql'] for query in queries.captured_queries
+                if 'notes_note"."slug' in query['sql']
+            ]
+            self.assertEqual(len(notes_sql), 1)
+            self.assertNotIn('OFFSET', notes_sql[0])
+            self.assertNotIn('"notes_note"."text"', notes_sql[0])
+            shown_notes += page
+            next_cursor = response.context['next_cursor']
+            url = (
+                f'{reverse("notes:list")}?after={next_cursor}'
+                if next_cursor else None
+            )
+        self.assertEqual(
+            shown_notes,
+            list(Note.objects.filter(author=self.author).order_by('id'))
+        )
+
+    def test_invalid_cursor(self):
+        """
+        Курсор не из цифр игнорируется, слишком большой
+        даёт пустую страницу; ошибки сервера нет.
+        """
+        all_notes = list(
+            Note.objects.filter(author=self.author).order_by('id')
+        )
+        for after, expected in (
+            ('x', all_notes), ('²', all_notes), ('-1', all_notes),
+            (str(2 ** 63 - 1), []), ('9' * 23, []), ('9' * 5000, []),
+        ):
+            with self.subTest(after=after[:25]):
+                response = self.author_client.get(
+                    reverse('notes:list'), {'after': after}
+                )
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+                self.assertEqual(
+                    list(response.context['object_list']), expected
+                )
+
+
+class TestNoteSearch(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Автор')
+        cls.author_client = Client()
+        cls.author_client.force_login(cls.author)
+        cls.reader = User.objects.create(username='Посетитель')
+        cls.in_title = Note.objects.create(
+            title='Рецепт борща',
+            text='Свёкла, капуста, картофель',
+            author=cls.author
+        )
+        cls.in_text = Note.objects.create(
+            title='Покупки',
+            text='Продукты для борща и хлеб',
+            author=cls.author
+        )
+        cls.other_author_note = Note.objects.create(
+            title='Борщ по-украински',
+            text='Рецепт борща',
+            author=cls.reader
+        )
+        cls.url = reverse('notes:search')
+
+    def search(self, query, **params):
+        response = self.author_client.get(self.url, {'q': query, **params})
+        return list(response.context['object_list'])
+
+    def test_search_ranks_title_matches_first(self):
+        """
+        Заметка находится по началу слова в заголовке или тексте.
+        Совпадение в заголовке выводится выше совпадения в тексте,
+        заметки других пользователей в результаты не попадают.
+        """
+        self.assertEqual(self.search('борщ'), [self.in_title, self.in_text])
+
+    def test_search_ignores_case(self):
+        """Поиск не различает регистр букв."""
+        self.assertEqual(self.search('КАПУСТ'), [self.in_title])
+
+    def test_search_index_follows_note_changes(self):
+        """Индекс обновляется при изменении и удалении заметки."""
+        self.in_text.text = 'Хлеб и молоко'
+        self.in_text.save()
+        self.assertEqual(self.search('борщ'), [self.in_title])
+        self.assertEqual(self.search('молоко'), [self.in_text])
+        self.in_title.delete()
+        self.assertEqual(self.search('борщ'), [])
+
+    def test_search_reads_authors_partition_only(self):
+        """
+        Поиск читает только часть индекса с заметками автора. Заметки
+        другого автора из той же части в результаты не попадают.
+        """
+        neighbour = User.objects.create(
+            id=self.author.pk + FTS_PARTITIONS, username='Сосед'
+        )
+        Note.objects.create(title='Борщ', text='Текст', author=neighbour)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(
+                self.search('борщ'), [self.in_title, self.in_text]
+            )
+        tables = {
+            table
+            for query in queries.captured_queries
+            for table in re.findall(r'\bnotes_note_fts_\d+\b', query['sql'])
+        }
+        self.assertEqual(tables, {fts_table(self.author.pk)})
+
+    def test_search_index_follows_author_change(self):
+        """Заметка переходит в часть индекса нового автора."""
+        Note.objects.filter(pk=self.other_author_note.pk).update(
+            author=self.author
+        )
+        self.assertIn(self.other_author_note, self.search('украински'))
+        Note.objects.filter(pk=self.in_title.pk).update(author=self.reader)
+        self.assertEqual(self.search('капуст'), [])
+
+    def test_query_syntax_is_not_interpreted(self):
+        """Служебный синтаксис FTS5 в запросе не вызывает ошибок."""
+        for query in ('"', 'борщ OR', 'NEAR(', 'author_id:1', '*', ''):
+            with self.subTest(query=query):
+                response = self.author_client.get(self.url, {'q': query})
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    @override_settings(NOTES_COUNT_ON_SEARCH_PAGE=1)
+    def test_search_is_paginated(self):
+        """Результаты поиска выводятся постранично."""
+        self.assertEqual(self.search('борщ', page=1), [self.in_title])
+        self.assertEqual(self.search('борщ', page=2), [self.in_text])
+        response = self.author_client.get(
+            self.url, {'q': 'борщ', 'page': 2}
+        )
+        self.assertFalse(response.context['has_next'])
+
+    @override_settings(NOTES_SEARCH_MAX_PAGE=5)
+    def test_search_page_is_clamped(self):
+        """
+        Номер страницы вне допустимых пределов не вызывает ошибку,
+        слишком большой заменяется последним допустимым.
+        """
+        for page, expected in (
+            ('0', 1), ('-1', 1), ('x', 1), ('²', 1), ('6', 5),
+            ('9' * 30, 5), ('9' * 5000, 5),
+        ):
+            with self.subTest(page=page[:10]):
+                response = self.author_client.get(
+                    self.url, {'q': 'борщ', 'page': page}
+                )
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+                self.assertEqual(response.context['page_number'], expected)
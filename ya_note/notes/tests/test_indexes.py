@@ -0,0 +1,32 @@
+from unittest import skipIf
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+
+from notes.models import Note
+
+
+User = get_user_model()
+
+
+@skipIf(
+    connection.vendor != 'sqlite',
+    'План запроса проверяется только для SQLite.'
+)
+class TestIndexes(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Автор')
+
+    def test_author_notes_use_index(self):
+        """
+        Заметки пользователя выбираются по индексу (author, id)
+        без полного просмотра таблицы и временной сортировки.
+        """
+        plan = Note.objects.filter(author=self.author).order_by('id').explain()
+        self.assertNotIn('TEMP B-TREE', plan)
+        for line in plan.splitlines():
+            if 'SCAN' in line:
+                self.assertIn('USING', line)
@@ -1,12 +1,25 @@
+import csv
+import io
+import json
+import os
+import tempfile
+import threading
 from http import HTTPStatus
+from unittest import mock, skipIf
 
 from django.contrib.auth import get_user_model
-from django.test import Client, TestCase
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import Client, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from pytils.translit import slugify
 
 from notes.forms import WARNING
 from notes.models import Note
+from notes.slugs import cached_slugify, slugify_cache_stats
+from notes.transfer import IMPORT_CHUNK_SIZE, import_notes
 
 
 User = get_user_model()
@@ -140,6 +153,19 @@ class TestNoteEditDelete(TestCase):
         notes_count = Note.objects.count()
         self.assertEqual(notes_count, initial_notes_count - 1)
 
+    def test_delete_does_not_load_note_text(self):
+        """
+        Ни страница удаления заметки, ни само удаление
+        не загружают из базы данных текст заметки.
+        """
+        for method in ('get', 'post'):
+            with self.subTest(method=method):
+                with CaptureQueriesContext(connection) as queries:
+                    getattr(self.author_client, method)(self.delete_url)
+                for query in queries.captured_queries:
+                    self.assertNotIn('"notes_note"."text"', query['sql'])
+        self.assertFalse(Note.objects.filter(pk=self.note.pk).exists())
+
     def test_user_cant_delete_note_of_another_user(self):
         """Пользователь не может удалять чужие заметки."""
         initial_notes_count = Note.objects.count()
@@ -165,3 +191,318 @@ class TestNoteEditDelete(TestCase):
         self.assertEqual(self.note.title, self.TITLE)
         self.assertEqual(self.note.text, self.TEXT)
         self.assertEqual(self.note.slug, self.SLUG)
+
+
+class TestSlugAllocation(TestCase):
+    """Класс тестирования автоматического подбора slug."""
+    TITLE = 'Покупки'
+    TEXT = 'Текст'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='Автор')
+        cls.user_client = Client()
+        cls.user_client.force_login(cls.user)
+
+    def test_same_titles_get_unique_slugs(self):
+        """
+        Заметки с одинаковыми заголовками получают разные slug
+        с числовым суффиксом, а не ошибку.
+        """
+        slug = slugify(self.TITLE)
+        for _ in range(3):
+            self.user_client.post(
+                reverse('notes:add'),
+                data={'title': self.TITLE, 'text': self.TEXT}
+            )
+        self.assertEqual(
+            list(Note.objects.order_by('id').values_list('slug', flat=True)),
+            [slug, f'{slug}-2', f'{slug}-3']
+        )
+
+    def test_title_is_transliterated_once(self):
+        """
+        При создании заметки заголовок транслитерируется один раз,
+        а повторяющиеся заголовки берутся из кеша.
+        """
+        cached_slugify.cache_clear()
+        with mock.patch(
+            'notes.slugs.slugify', wraps=slugify
+        ) as slugify_mock:
+            for _ in range(2):
+                self.user_client.post(
+                    reverse('notes:add'),
+                    data={'title': self.TITLE, 'text': self.TEXT}
+                )
+        slugify_mock.assert_called_once_with(self.TITLE)
+        stats = slugify_cache_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+        self.assertEqual(stats['hit_rate'], 0.5)
+
+    def test_slug_allocation_query_count(self):
+        """
+        Подбор slug занимает один запрос
+        независимо от числа заметок с таким же заголовком.
+        """
+        for notes_count in (0, 20):
+            Note.objects.bulk_create(
+                Note(
+                    title=self.TITLE,
+                    text=self.TEXT,
+                    slug=f'{slugify(self.TITLE)}-{index + 2}',
+                    author=self.user
+                )
+                for index in range(notes_count)
+            )
+            with self.subTest(notes_count=notes_count):
+                # Подбор slug, точка сохранения, вставка, её завершение.
+                with self.assertNumQueries(4):
+                    Note.objects.create(
+                        title=self.TITLE, text=self.TEXT, author=self.user
+                    )
+
+
+@skipIf(
+    connection.vendor != 'sqlite' or connection.is_in_memory_db(),
+    'Нужна файловая база SQLite.'
+)
+class TestSlugAllocationConcurrency(TransactionTestCase):
+    """Класс тестирования подбора slug при параллельных запросах."""
+    THREADS = 8
+    NOTES_PER_THREAD = 5
+
+    def setUp(self):
+        self.author = User.objects.create(username='Автор')
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode=WAL')
+
+    def test_parallel_notes_with_same_title(self):
+        """
+        Параллельно созданные заметки с одинаковым заголовком
+        сохраняются без ошибок и получают разные slug.
+        """
+        errors = []
+        barrier = threading.Barrier(self.THREADS)
+
+        def create_notes():
+            try:
+                barrier.wait()
+                for _ in range(self.NOTES_PER_THREAD):
+                    Note.objects.create(
+                        title='Покупки', text='Текст', author=self.author
+                    )
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=create_notes)
+            for _ in range(self.THREADS)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        slugs = list(Note.objects.values_list('slug', flat=True))
+        self.assertEqual(len(slugs), self.THREADS * self.NOTES_PER_THREAD)
+        self.assertEqual(len(set(slugs)), len(slugs))
+
+
+class TestNoteImportExport(TestCase):
+    """Класс тестирования загрузки и выгрузки заметок."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Автор')
+        cls.author_client = Client()
+        cls.author_client.force_login(cls.author)
+        cls.reader = User.objects.create(username='Посетитель')
+        Note.objects.create(
+            title='Покупки', text='Хлеб', author=cls.reader
+        )
+        cls.records = [
+            {'title': 'Покупки', 'text': f'Текст {index}', 'slug': ''}
+            for index in range(5)
+        ] + [{'title': 'Идеи', 'text': 'Текст', 'slug': 'my-ideas'}]
+
+    def import_records(self, records, **options):
+        return import_notes(self.author, records, **options)
+
+    def count_selects(self, records, **options):
+        with CaptureQueriesContext(connection) as queries:
+            self.import_records(records, **options)
+        return len([
+            query for query in queries.captured_queries
+            if query['sql'].startswith('SELECT')
+        ])
+
+    def test_slugs_are_allocated_in_one_query_per_chunk(self):
+        """
+        Slug порции подбираются одним запросом на порцию. Одинаковые
+        заголовки получают разные slug, которые не совпадают с уже
+        занятыми, а указанный в записи slug сохраняется.
+        """
+        self.assertEqual(self.count_selects(self.records, chunk_size=3), 2)
+        slugs = list(
+            Note.objects.filter(author=self.author).order_by(
+                'id'
+            ).values_list('slug', flat=True)
+        )
+        self.assertEqual(
+            slugs,
+            ['pokupki-2', 'pokupki-3', 'pokupki-4', 'pokupki-5', 'pokupki-6',
+             'my-ideas']
+        )
+
+    def test_query_count_does_not_depend_on_titles(self):
+        """
+        Число запросов не растёт с числом разных заголовков в порции,
+        даже если все заголовки полной порции разные. Занятые варианты
+        каждого заголовка учитываются, в том числе когда вариант одного
+        заголовка совпадает с транслитерацией другого.
+        """
+        for slug in ('idei', 'idei-3', 'zametka-7'):
+            Note.objects.create(
+                title='Идеи', text='Текст', slug=slug, author=self.reader
+            )
+        records = [
+            {'title': f'Заметка {index}', 'text': 'Текст'}
+            for index in range(1, IMPORT_CHUNK_SIZE - 1)
+        ] + [
+            {'title': 'Идеи', 'text': 'Текст'},
+            {'title': 'Идеи 3', 'text': 'Текст'},
+        ]
+        self.assertEqual(self.count_selects(records), 1)
+        slugs = set(
+            Note.objects.filter(author=self.author).values_list(
+                'slug', flat=True
+            )
+        )
+        self.assertIn('zametka-7-2', slugs)
+        self.assertIn('zametka-8', slugs)
+        self.assertIn('idei-4', slugs)
+        self.assertIn('idei-3-2', slugs)
+        self.assertEqual(len(slugs), len(records))
+
+    def test_malformed_records_are_rejected(self):
+        """
+        Запись не того типа не даёт загрузить файл: и форма,
+        и команда import_notes сообщают номер записи.
+        """
+        for line, message in (
+            ('[1, 2]', 'Запись 2: ожидался объект'),
+            ('"Покупки"', 'Запись 2: ожидался объект'),
+            ('{"title": 5, "text": "Хлеб"}', 'Запись 2: поле title'),
+            ('{"title": "Покупки", "text": ["Хлеб"]}', 'Запись 2: поле text'),
+        ):
+            content = '{"title": "Идеи", "text": "Текст"}\n' + line + '\n'
+            with self.subTest(line=line):
+                response = self.author_client.post(
+                    reverse('notes:import'),
+                    {'file': SimpleUploadedFile(
+                        'notes.jsonl', content.encode()
+                    )}
+                )
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+                self.assertIn(
+                    message, ' '.join(response.context['form'].errors['file'])
+                )
+                with tempfile.TemporaryDirectory() as directory:
+                    path = os.path.join(directory, 'notes.jsonl')
+                    with open(path, 'w', encoding='utf-8') as file:
+                        file.write(content)
+                    with self.assertRaisesMessage(CommandError, message):
+                        call_command(
+                            'import_notes', self.author.username, path,
+                            stdout=io.StringIO()
+                        )
+                self.assertFalse(
+                    Note.objects.filter(author=self.author).exists()
+                )
+
+    def test_taken_slug_is_rejected(self):
+        """Занятый slug в записи не даёт загрузить файл."""
+        Note.objects.create(
+            title='Идеи', text='Текст', slug='my-ideas', author=self.reader
+        )
+        with self.assertRaisesMessage(ValueError, 'my-ideas' + WARNING):
+            self.import_records(self.records)
+
+    def test_upload_and_download_round_trip(self):
+        """
+        Загруженный файл сохраняется в заметки автора, выгрузка
+        отдаёт их потоком в JSONL и CSV и только заметки автора.
+        """
+        upload = SimpleUploadedFile(
+            'notes.jsonl',
+            ''.join(
+                json.dumps(record, ensure_ascii=False) + '\n'
+                for record in self.records
+            ).encode()
+        )
+        response = self.author_client.post(
+            reverse('notes:import'), {'file': upload}
+        )
+        self.assertRedirects(response, reverse('notes:success'))
+        expected = list(
+            Note.objects.filter(author=self.author).order_by(
+                'id'
+            ).values_list('title', 'text', 'slug')
+        )
+        self.assertEqual(len(expected), len(self.records))
+        response = self.author_client.get(
+            reverse('notes:export'), {'format': 'jsonl'}
+        )
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(
+            [tuple(json.loads(line).values()) for line in lines], expected
+        )
+        response = self.author_client.get(
+            reverse('notes:export'), {'format': 'csv'}
+        )
+        rows = list(csv.reader(io.StringIO(
+            b''.join(response.streaming_content).decode()
+        )))
+        self.assertEqual(rows[0], ['title', 'text', 'slug'])
+        self.assertEqual([tuple(row) for row in rows[1:]], expected)
+
+    def test_invalid_upload_saves_nothing(self):
+        """Ошибка в одной записи отменяет загрузку всего файла."""
+        upload = SimpleUploadedFile(
+            'notes.csv', 'title,text\nПокупки,Хлеб\nБез текста,\n'.encode()
+        )
+        response = self.author_client.post(
+            reverse('notes:import'), {'file': upload}
+        )
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertTrue(response.context['form'].errors)
+        self.assertFalse(Note.objects.filter(author=self.author).exists())
+
+    def test_management_commands(self):
+        """Команды import_notes и export_notes переносят заметки."""
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, 'source.csv')
+            target = os.path.join(directory, 'target.csv')
+            with open(source, 'w', encoding='utf-8', newline='') as file:
+                writer = csv.DictWriter(file, ('title', 'text', 'slug'))
+                writer.writeheader()
+                writer.writerows(self.records)
+            call_command(
+                'import_notes', self.author.username, source,
+                chunk_size=2, stdout=io.StringIO()
+            )
+            call_command(
+                'export_notes', self.author.username,
+                output=target, format='csv', chunk_size=2
+            )
+            with open(source, encoding='utf-8') as file:
+                source_rows = list(csv.DictReader(file))
+            with open(target, encoding='utf-8') as file:
+                target_rows = list(csv.DictReader(file))
+        self.assertEqual(
+            [row['text'] for row in target_rows],
+            [row['text'] for row in source_rows]
+        )
@@ -47,12 +47,16 @@ class TestRoutes(TestCase):
         """
         Авторизованному пользователю доступна страница со списком заметок,
         страница добавления новой заметки,
-        страница успешного добавления заметки.
+        страница успешного добавления заметки,
+        страницы поиска, загрузки и выгрузки заметок.
         """
         for name in (
             'notes:list',
             'notes:add',
-            'notes:success'
+            'notes:success',
+            'notes:search',
+            'notes:import',
+            'notes:export'
         ):
             with self.subTest(name=name):
                 url = reverse(name)
@@ -92,6 +96,9 @@ class TestRoutes(TestCase):
             ('notes:list', None),
             ('notes:add', None),
             ('notes:success', None),
+            ('notes:search', None),
+            ('notes:import', None),
+            ('notes:export', None),
             ('notes:detail', self.note_slug_for_args),
             ('notes:edit', self.note_slug_for_args),
             ('notes:delete', self.note_slug_for_args)
@@ -101,3 +108,64 @@ class TestRoutes(TestCase):
                 redirect_url = f'{login_url}?next={url}'
                 response = self.client.get(url)
                 self.assertRedirects(response, redirect_url)
+
+
+class TestConditionalGet(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Автор')
+        cls.author_client = Client()
+        cls.author_client.force_login(cls.author)
+        cls.note = Note.objects.create(
+            title='Заголовок',
+            text='Текст',
+            author=cls.author
+        )
+
+    def test_not_modified(self):
+        """
+        Список заметок и отдельная заметка отдают ETag.
+        Пока заметки не изменились, повторный запрос получает ответ 304,
+        после изменения — страницу целиком.
+        """
+        for name, args in (
+            ('notes:list', None),
+            ('notes:detail', (self.note.slug,)),
+        ):
+            with self.subTest(name=name):
+                url = reverse(name, args=args)
+                response = self.author_client.get(url)
+                etag = response['ETag']
+                response = self.author_client.get(
+                    url, HTTP_IF_NONE_MATCH=etag
+                )
+                self.assertEqual(
+                    response.status_code, HTTPStatus.NOT_MODIFIED
+                )
+                self.note.text = 'Новый текст'
+                self.note.save()
+                response = self.author_client.get(
+                    url, HTTP_IF_NONE_MATCH=etag
+                )
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    def test_note_detail_last_modified(self):
+        """Заметка отдаёт Last-Modified, по которому возможен ответ 304."""
+        url = reverse('notes:detail', args=(self.note.slug,))
+        # Сессия, пользователь, время изменения заметки, сама заметка.
+        with self.assertNumQueries(4):
+            response = self.author_client.get(url)
+        response = self.author_client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+
+    def test_deleted_note_changes_list_etag(self):
+        """Удаление заметки меняет ETag списка заметок."""
+        url = reverse('notes:list')
+        etag = self.author_client.get(url)['ETag']
+        Note.objects.create(title='Другая', text='Текст', author=self.author)
+        Note.objects.filter(pk=self.note.pk).delete()
+        response = self.author_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
@@ -0,0 +1,37 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import TestCase
+
+from notes.sqlite import apply_pragmas
+
+
+class TestSqlitePragmas(TestCase):
+    # Значения, которые SQLite возвращает для профиля из настроек.
+    EXPECTED_PRAGMAS = {
+        'journal_mode': 'wal',
+        'synchronous': 1,
+        'busy_timeout': 5000,
+        'cache_size': -64 * 1024,
+        'temp_store': 2,
+    }
+
+    def read_pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_connection_uses_pragma_profile(self):
+        """Соединение с базой получает PRAGMA из SQLITE_PRAGMAS."""
+        for name, value in self.EXPECTED_PRAGMAS.items():
+            with self.subTest(name=name):
+                self.assertEqual(self.read_pragma(name), value)
+
+    def test_invalid_pragma_is_rejected(self):
+        """Некорректное имя или значение PRAGMA не попадает в SQL."""
+        for pragmas in (
+            {'synchronous; DROP TABLE notes_note': 'OFF'},
+            {'synchronous': 'OFF; DROP TABLE notes_note'},
+        ):
+            with self.subTest(pragmas=pragmas):
+                with self.assertRaises(ImproperlyConfigured):
+                    apply_pragmas(connection, pragmas)
@@ -0,0 +1,33 @@
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import CommandError, call_command
+from django.template import engines
+from django.test import SimpleTestCase, override_settings
+
+from yanote.settings import TEMPLATES
+from yanote.settings_production import TEMPLATES as PRODUCTION_TEMPLATES
+
+
+class TestPrecompileTemplates(SimpleTestCase):
+
+    @override_settings(TEMPLATES=PRODUCTION_TEMPLATES)
+    def test_templates_are_cached(self):
+        """Команда разбирает шаблоны проекта и кеширует их."""
+        out = StringIO()
+        call_command('precompile_templates', stdout=out)
+        self.assertIn('Разобрано шаблонов', out.getvalue())
+        cached = engines['django'].engine.template_loaders[0]
+        self.assertIn('notes/list.html', cached.get_template_cache)
+
+    def test_syntax_error_stops_command(self):
+        """Синтаксическая ошибка в шаблоне останавливает команду."""
+        with tempfile.TemporaryDirectory() as directory:
+            Path(directory, 'broken.html').write_text(
+                '{% if %}', encoding='utf-8'
+            )
+            with override_settings(
+                TEMPLATES=[{**TEMPLATES[0], 'DIRS': [directory]}]
+            ), self.assertRaisesMessage(CommandError, 'broken.html'):
+                call_command('precompile_templates')
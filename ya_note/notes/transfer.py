@@ -0,0 +1,260 @@
+import csv
+import json
+import re
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_slug
+from django.db import IntegrityError, connection, transaction
+
+from .forms import WARNING
+from .models import (
+    SLUG_ALLOCATION_ATTEMPTS, SLUG_SUFFIX_LENGTH, Note
+)
+from .slugs import cached_slugify
+
+FORMATS = ('jsonl', 'csv')
+FIELDS = ('title', 'text', 'slug')
+CONTENT_TYPES = {
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+    'csv': 'text/csv; charset=utf-8',
+}
+IMPORT_CHUNK_SIZE = 1000
+EXPORT_CHUNK_SIZE = 1000
+TITLE_MAX_LENGTH = Note._meta.get_field('title').max_length
+SLUG_MAX_LENGTH = Note._meta.get_field('slug').max_length
+# Последний занятый вариант каждого base: 1 — занят сам base,
+# N — занят base-N. Заголовки порции — внешний цикл (CROSS JOIN
+# в SQLite фиксирует порядок), для каждого читается диапазон
+# индекса по slug. Условия не объединяются через OR: SQLite
+# ограничивает глубину выражения тысячей.
+TAKEN_VARIANTS_SQL = '''
+    SELECT bases.base, MAX(
+        CASE WHEN notes_note.slug = bases.base THEN 1
+        ELSE CAST(SUBSTR(notes_note.slug, LENGTH(bases.base) + 2) AS INTEGER)
+        END
+    ), NULL
+    FROM (
+        SELECT column1 AS base, column2 AS upper, column3 AS pattern
+        FROM (VALUES {values})
+    ) AS bases
+    CROSS JOIN notes_note
+    ON notes_note.slug >= bases.base AND notes_note.slug < bases.upper
+    AND (
+        notes_note.slug = bases.base
+        OR notes_note.slug REGEXP bases.pattern
+    )
+    GROUP BY bases.base
+'''
+# Занятые slug из указанных в записях.
+TAKEN_SLUGS_SQL = '''
+    SELECT NULL, NULL, slug FROM notes_note WHERE slug IN ({values})
+'''
+
+
+def guess_format(filename):
+    """Формат файла по расширению; для неизвестного возвращает None."""
+    extension = filename.rsplit('.', 1)[-1].lower()
+    return extension if extension in FORMATS else None
+
+
+def read_records(file, file_format):
+    """Записи текстового файла JSONL или CSV по одной."""
+    if file_format == 'csv':
+        yield from csv.DictReader(file)
+        return
+    for line in file:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as error:
+            raise ValueError(f'Некорректный JSON: {error}')
+
+
+def make_note(number, record, author):
+    if not isinstance(record, dict):
+        raise ValueError(
+            f'Запись {number}: ожидался объект с полями {", ".join(FIELDS)}'
+        )
+    for field in FIELDS:
+        if not isinstance(record.get(field) or '', str):
+            raise ValueError(
+                f'Запись {number}: поле {field} должно быть строкой'
+            )
+    title = record.get('title') or ''
+    text = record.get('text') or ''
+    slug = record.get('slug') or ''
+    if not title or not text:
+        raise ValueError(f'Запись {number}: нет заголовка или текста')
+    if len(title) > TITLE_MAX_LENGTH:
+        raise ValueError(
+            f'Запись {number}: заголовок длиннее {TITLE_MAX_LENGTH} символов'
+        )
+    if slug:
+        try:
+            validate_slug(slug)
+        except ValidationError:
+            raise ValueError(f'Запись {number}: некорректный slug {slug!r}')
+        if len(slug) > SLUG_MAX_LENGTH:
+            raise ValueError(
+                f'Запись {number}: slug длиннее {SLUG_MAX_LENGTH} символов'
+            )
+    return Note(title=title, text=text, slug=slug, author=author)
+
+
+def find_taken_slugs(bases, explicit):
+    """
+    Занятые slug порции одним запросом.
+
+    Возвращает номера последних занятых вариантов каждого base,
+    как last_slug_number, и занятые slug из списка explicit.
+    Для каждого base читается диапазон индекса от base до base + '.',
+    а номер считается агрегатом, поэтому из базы читается по строке
+    на заголовок порции, сколько бы заметок ни было с таким заголовком.
+    """
+    selects = []
+    params = []
+    if bases:
+        selects.append(
+            TAKEN_VARIANTS_SQL.format(
+                values=', '.join(['(%s, %s, %s)'] * len(bases))
+            )
+        )
+        for base in bases:
+            params += [base, base + '.', rf'^{re.escape(base)}-[1-9][0-9]*$']
+    if explicit:
+        selects.append(
+            TAKEN_SLUGS_SQL.format(values=', '.join(['%s'] * len(explicit)))
+        )
+        params += explicit
+    last_numbers = dict.fromkeys(bases, 0)
+    taken = set()
+    if not selects:
+        return last_numbers, taken
+    with connection.cursor() as cursor:
+        cursor.execute(' UNION ALL '.join(selects).strip(), params)
+        for base, number, slug in cursor.fetchall():
+            if slug is None:
+                last_numbers[base] = number
+            else:
+                taken.add(slug)
+    return last_numbers, taken
+
+
+def allocate_slugs(notes):
+    """
+    Подбирает slug всем заметкам порции.
+
+    Заметкам без slug достаётся транслитерация заголовка или, если она
+    занята, следующий свободный вариант с суффиксом -2, -3 и так далее.
+    Занятые варианты всех заголовков и указанные в записях slug
+    проверяются одним запросом на порцию. Одинаковые заголовки внутри
+    порции получают разные суффиксы. Указанный в записи slug должен
+    быть свободен, иначе выбрасывается ValueError.
+    """
+    max_base_length = SLUG_MAX_LENGTH - SLUG_SUFFIX_LENGTH
+    explicit = [note.slug for note in notes if note.slug]
+    generated = [
+        (note, cached_slugify(note.title)[:max_base_length])
+        for note in notes if not note.slug
+    ]
+    last_numbers, taken = find_taken_slugs(
+        list(dict.fromkeys(base for _, base in generated)), explicit
+    )
+    for slug in explicit:
+        if slug in taken:
+            raise ValueError(slug + WARNING)
+        taken.add(slug)
+    for note, base in generated:
+        number = last_numbers[base]
+        slug = f'{base}-{number + 1}' if number else base
+        # Вариант мог достаться другой заметке порции.
+        while slug in taken:
+            number += 1
+            slug = f'{base}-{number + 1}'
+        note.slug = slug
+        taken.add(slug)
+        last_numbers[base] = number + 1
+
+
+def save_chunk(notes):
+    """
+    Сохраняет порцию заметок одним bulk_create.
+
+    Если slug из порции успел занять параллельный запрос, порция
+    откатывается, и slug подбираются заново.
+    """
+    generated = [not note.slug for note in notes]
+    for _ in range(SLUG_ALLOCATION_ATTEMPTS):
+        allocate_slugs(notes)
+        try:
+            with transaction.atomic():
+                Note.objects.bulk_create(notes)
+                return
+        except IntegrityError:
+            for note, reset in zip(notes, generated):
+                if reset:
+                    note.slug = ''
+    raise IntegrityError('Не удалось подобрать свободные slug для заметок.')
+
+
+def import_notes(author, records, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Сохраняет заметки автора из потока записей.
+
+    Записи читаются и сохраняются порциями по chunk_size, каждая
+    порция — в своей транзакции, поэтому память не растёт с размером
+    файла. Возвращает число сохранённых заметок.
+    """
+    count = 0
+    chunk = []
+    for number, record in enumerate(records, start=1):
+        chunk.append(make_note(number, record, author))
+        if len(chunk) == chunk_size:
+            save_chunk(chunk)
+            count += len(chunk)
+            chunk = []
+    if chunk:
+        save_chunk(chunk)
+    return count + len(chunk)
+
+
+class EchoBuffer:
+    """Файл для csv.writer, который возвращает строку вместо записи."""
+
+    def write(self, value):
+        return value
+
+
+def iter_author_notes(author, chunk_size):
+    """
+    Заметки автора порциями по курсору id.
+
+    Каждая порция — отдельный короткий запрос, поэтому долгая выгрузка
+    не держит открытой транзакцию чтения.
+    """
+    last_id = 0
+    while True:
+        notes = list(
+            Note.objects.filter(
+                author=author, id__gt=last_id
+            ).order_by('id').values_list('id', *FIELDS)[:chunk_size]
+        )
+        for note in notes:
+            yield note[1:]
+        if len(notes) < chunk_size:
+            return
+        last_id = notes[-1][0]
+
+
+def export_notes(author, file_format, chunk_size=EXPORT_CHUNK_SIZE):
+    """Строки файла JSONL или CSV со всеми заметками автора."""
+    notes = iter_author_notes(author, chunk_size)
+    if file_format == 'csv':
+        writer = csv.writer(EchoBuffer())
+        yield writer.writerow(FIELDS)
+        for note in notes:
+            yield writer.writerow(note)
+        return
+    for note in notes:
+        yield json.dumps(dict(zip(FIELDS, note)), ensure_ascii=False) + '\n'
@@ -1,9 +1,56 @@
+import io
+
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Max
+from django.http import (
+    HttpResponse, HttpResponseRedirect, StreamingHttpResponse
+)
 from django.urls import reverse_lazy
+from django.utils.decorators import method_decorator
 from django.views import generic
+from django.views.decorators.http import condition
 
-from .forms import NoteForm
+from .connections import connection_stats
+from .forms import WARNING, NoteForm, NoteImportForm
 from .models import Note
+from .search import search_notes
+from .transfer import (
+    CONTENT_TYPES, export_notes, guess_format, import_notes, read_records
+)
+
+# Наибольшее целое, которое SQLite хранит в INTEGER.
+MAX_NOTE_ID = 2 ** 63 - 1
+
+
+def notes_list_etag(request, *args, **kwargs):
+    """
+    Значение ETag списка заметок: число заметок и время последнего изменения.
+
+    Удаление заметки меняет число, создание и редактирование —
+    время изменения, поэтому страницу не нужно формировать для сравнения.
+    """
+    stats = Note.objects.filter(author=request.user).aggregate(
+        count=Count('pk'), modified=Max('modified')
+    )
+    modified = stats['modified'].timestamp() if stats['modified'] else 0
+    return f'{request.user.pk}-{stats["count"]}-{modified}'
+
+
+def note_last_modified(request, slug, *args, **kwargs):
+    """Время изменения заметки запрашивается один раз на запрос."""
+    if not hasattr(request, '_note_modified'):
+        request._note_modified = Note.objects.filter(
+            author=request.user, slug=slug
+        ).values_list('modified', flat=True).first()
+    return request._note_modified
+
+
+def note_etag(request, slug, *args, **kwargs):
+    modified = note_last_modified(request, slug)
+    if modified:
+        return f'{request.user.pk}-{modified.timestamp()}'
 
 
 class Home(generic.TemplateView):
@@ -20,10 +67,15 @@ class NoteBase(LoginRequiredMixin):
     """Базовый класс для остальных CBV."""
     model = Note
     success_url = reverse_lazy('notes:success')
+    # Поля, которые представлению не нужны и не загружаются из базы.
+    deferred_fields = ()
 
     def get_queryset(self):
         """Пользователь может работать только со своими заметками."""
-        return self.model.objects.filter(author=self.request.user)
+        notes = self.model.objects.filter(author=self.request.user)
+        if self.deferred_fields:
+            notes = notes.defer(*self.deferred_fields)
+        return notes
 
 
 class NoteCreate(NoteBase, generic.CreateView):
@@ -34,8 +86,15 @@ class NoteCreate(NoteBase, generic.CreateView):
     def form_valid(self, form):
         new_note = form.save(commit=False)
         new_note.author = self.request.user
-        new_note.save()
-        return super().form_valid(form)
+        try:
+            with transaction.atomic():
+                new_note.save()
+        except IntegrityError:
+            # Указанный slug успели занять после проверки в форме.
+            form.add_error('slug', new_note.slug + WARNING)
+            return self.form_invalid(form)
+        self.object = new_note
+        return HttpResponseRedirect(self.get_success_url())
 
 
 class NoteUpdate(NoteBase, generic.UpdateView):
@@ -47,13 +106,152 @@ class NoteUpdate(NoteBase, generic.UpdateView):
 class NoteDelete(NoteBase, generic.DeleteView):
     """Удаление заметки."""
     template_name = 'notes/delete.html'
+    deferred_fields = ('text',)
 
 
+@method_decorator(condition(etag_func=notes_list_etag), name='get')
 class NotesList(NoteBase, generic.ListView):
     """Список всех заметок пользователя."""
     template_name = 'notes/list.html'
 
+    def get_queryset(self):
+        """
+        Выбираем одну страницу заметок по курсору id.
+
+        Страница ограничена по размеру и выбирается без OFFSET,
+        а из заметок загружаются только поля, нужные шаблону.
+        """
+        notes = super().get_queryset().only(
+            'id', 'slug', 'title'
+        ).order_by('id')
+        after = self.request.GET.get('after', '')
+        if after.isdecimal():
+            # Курсор больше наибольшего целого SQLite не может быть
+            # id заметки: после него заметок нет. Слишком длинная строка
+            # цифр не переводится в int.
+            if (
+                len(after) > len(str(MAX_NOTE_ID))
+                or int(after) >= MAX_NOTE_ID
+            ):
+                return notes.none()
+            notes = notes.filter(id__gt=int(after))
+        return notes[:settings.NOTES_COUNT_ON_LIST_PAGE + 1]
+
+    def get_context_data(self, **kwargs):
+        notes = list(self.object_list)
+        page = notes[:settings.NOTES_COUNT_ON_LIST_PAGE]
+        context = super().get_context_data(object_list=page, **kwargs)
+        context['next_cursor'] = (
+            page[-1].id if len(notes) > len(page) else None
+        )
+        return context
+
+
+class NoteSearch(NoteBase, generic.ListView):
+    """Поиск по заметкам пользователя."""
+    template_name = 'notes/search.html'
+
+    def get_queryset(self):
+        """
+        Одна страница результатов полнотекстового поиска.
 
+        Выбираем на одну заметку больше размера страницы, чтобы узнать,
+        есть ли следующая, не считая все совпадения.
+        """
+        self.query = self.request.GET.get('q', '').strip()
+        self.page_number = self.get_page_number()
+        per_page = settings.NOTES_COUNT_ON_SEARCH_PAGE
+        return search_notes(
+            self.request.user,
+            self.query,
+            offset=(self.page_number - 1) * per_page,
+            limit=per_page + 1
+        )
+
+    def get_page_number(self):
+        """
+        Номер страницы из ?page=, не больше NOTES_SEARCH_MAX_PAGE.
+
+        Слишком длинная строка цифр не переводится в int:
+        она заведомо больше предела.
+        """
+        page = self.request.GET.get('page', '')
+        max_page = settings.NOTES_SEARCH_MAX_PAGE
+        if not page.isdecimal():
+            return 1
+        if len(page) > len(str(max_page)):
+            return max_page
+        return min(max(int(page), 1), max_page)
+
+    def get_context_data(self, **kwargs):
+        per_page = settings.NOTES_COUNT_ON_SEARCH_PAGE
+        page = self.object_list[:per_page]
+        context = super().get_context_data(object_list=page, **kwargs)
+        context['query'] = self.query
+        context['page_number'] = self.page_number
+        context['has_next'] = len(self.object_list) > per_page
+        return context
+
+
+@method_decorator(
+    condition(etag_func=note_etag, last_modified_func=note_last_modified),
+    name='get'
+)
 class NoteDetail(NoteBase, generic.DetailView):
     """Заметка подробно."""
     template_name = 'notes/detail.html'
+
+
+class NoteImport(NoteBase, generic.FormView):
+    """Загрузка заметок из файла."""
+    template_name = 'notes/import.html'
+    form_class = NoteImportForm
+
+    def form_valid(self, form):
+        """
+        Файл читается потоком и сохраняется порциями.
+
+        Ошибка в любой записи отменяет загрузку целиком.
+        """
+        upload = form.cleaned_data['file']
+        file = io.TextIOWrapper(upload, encoding='utf-8-sig', newline='')
+        try:
+            with transaction.atomic():
+                import_notes(
+                    self.request.user,
+                    read_records(file, guess_format(upload.name))
+                )
+        except (ValueError, UnicodeDecodeError) as error:
+            form.add_error('file', str(error))
+            return self.form_invalid(form)
+        return super().form_valid(form)
+
+
+class NoteExport(NoteBase, generic.View):
+    """Выгрузка всех заметок пользователя в файл."""
+
+    def get(self, request, *args, **kwargs):
+        """Файл формируется по мере отправки, заметки читаются порциями."""
+        file_format = request.GET.get('format')
+        if file_format not in CONTENT_TYPES:
+            file_format = 'jsonl'
+        response = StreamingHttpResponse(
+            export_notes(request.user, file_format),
+            content_type=CONTENT_TYPES[file_format]
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="notes.{file_format}"'
+        )
+        return response
+
+
+def db_stats(request):
+    """Счётчики соединений с базой данных в текстовом формате Prometheus."""
+    stats = connection_stats()
+    return HttpResponse(
+        f'db_requests_total {stats["requests"]}\n'
+        f'db_connections_opened_total {stats["connections_opened"]}\n'
+        'db_connection_health_check_failures_total '
+        f'{stats["health_check_failures"]}\n',
+        content_type='text/plain; version=0.0.4'
+    )
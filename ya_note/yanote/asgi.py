@@ -3,14 +3,33 @@ ASGI config for yanote project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Database connections: Django 3.2 runs every synchronous view of every
+request in one shared thread, so the process holds a single connection
+per database. It is reused for up to ``CONN_MAX_AGE`` seconds and
+health-checked before each request, the same as under WSGI. The same
+thread also serialises the views, so ASGI brings no extra database
+concurrency here.
+
+Templates: with ``PRECOMPILE_TEMPLATES`` set (the production settings
+profile) every template is loaded and parsed when the application is
+created, so a syntax error stops the worker from starting and the
+cached loader is warm before the first request.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
 """
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yanote.settings')
 
 application = get_asgi_application()
+
+if settings.PRECOMPILE_TEMPLATES:
+    # Imported only after Django is set up by the call above.
+    from notes.template_warmup import precompile_templates
+
+    precompile_templates()
@@ -1,3 +1,5 @@
+import os
+import tempfile
 from pathlib import Path
 
 from django.urls import reverse_lazy
@@ -49,6 +51,10 @@ TEMPLATES = [
     },
 ]
 
+# Разбирать ли все шаблоны при запуске WSGI- и ASGI-приложения
+# (см. settings_production.py).
+PRECOMPILE_TEMPLATES = False
+
 WSGI_APPLICATION = 'yanote.wsgi.application'
 
 
@@ -56,9 +62,37 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Соединение живёт до CONN_MAX_AGE секунд и переиспользуется
+        # следующими запросами того же потока; перед каждым запросом
+        # оно проверяется (CONN_HEALTH_CHECKS). См. wsgi.py и asgi.py.
+        'CONN_MAX_AGE': 60,
+        'CONN_HEALTH_CHECKS': True,
+        # Тестовая база во временном файле, чтобы тесты могли писать
+        # в неё из нескольких потоков одновременно. У каждого процесса
+        # свой файл: тесты и бенчмарки не мешают друг другу.
+        'TEST': {
+            'NAME': Path(tempfile.gettempdir()) / (
+                f'yanote_test_{os.getpid()}.sqlite3'
+            ),
+        },
     }
 }
 
+# PRAGMA, которые выполняются на каждом новом соединении с SQLite.
+# WAL позволяет читать во время записи. synchronous=NORMAL в режиме WAL
+# сохраняет целостность базы при сбое питания, но последние транзакции
+# могут потеряться. busy_timeout — сколько миллисекунд ждать блокировку
+# записи, прежде чем вернуть «database is locked».
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 256 * 1024 * 1024,
+    # Отрицательное значение — размер в килобайтах.
+    'cache_size': -64 * 1024,
+    'temp_store': 'MEMORY',
+}
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -87,3 +121,10 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 LOGIN_URL = reverse_lazy('users:login')
 LOGIN_REDIRECT_URL = reverse_lazy('notes:home')
+
+NOTES_COUNT_ON_LIST_PAGE = 100
+NOTES_COUNT_ON_SEARCH_PAGE = 20
+# Дальние страницы поиска отдаются как последняя допустимая,
+# чтобы OFFSET не выходил за пределы целых чисел SQLite.
+NOTES_SEARCH_MAX_PAGE = 1000
+NOTES_SLUGIFY_CACHE_SIZE = 10000